@@ -14,9 +14,9 @@ from core.state_manager import StateManager
 from utils.timezone import now_helsinki
 
 
-@dataclass
+@dataclass(frozen=True)
 class Position:
-    """Represents a single position"""
+    """Represents a single position (immutable - PositionManager caches per-side aggregates)"""
     side: str  # 'Buy' or 'Sell'
     entry_price: float
     quantity: float
@@ -70,6 +70,13 @@ class PositionManager:
         self.long_positions: List[Position] = []
         self.short_positions: List[Position] = []
 
+        # Running totals per side (sum of quantity and of entry_price * quantity),
+        # maintained by add_position()/remove_all_positions()
+        self._long_qty = 0.0
+        self._long_notional = 0.0
+        self._short_qty = 0.0
+        self._short_notional = 0.0
+
         # Track last entry prices for grid calculation
         self.last_long_entry: Optional[float] = None
         self.last_short_entry: Optional[float] = None
@@ -120,6 +127,8 @@ class PositionManager:
         with self._lock:
             if side == 'Buy':
                 self.long_positions.append(position)
+                self._long_qty += quantity
+                self._long_notional += entry_price * quantity
                 self.last_long_entry = entry_price
                 self.logger.info(
                     f"Added LONG position: {quantity} @ ${entry_price:.4f} "
@@ -127,6 +136,8 @@ class PositionManager:
                 )
             else:
                 self.short_positions.append(position)
+                self._short_qty += quantity
+                self._short_notional += entry_price * quantity
                 self.last_short_entry = entry_price
                 self.logger.info(
                     f"Added SHORT position: {quantity} @ ${entry_price:.4f} "
@@ -147,11 +158,15 @@ class PositionManager:
             if side == 'Buy':
                 count = len(self.long_positions)
                 self.long_positions = []
+                self._long_qty = 0.0
+                self._long_notional = 0.0
                 self.last_long_entry = None
                 self.logger.info(f"Closed all {count} LONG positions")
             else:
                 count = len(self.short_positions)
                 self.short_positions = []
+                self._short_qty = 0.0
+                self._short_notional = 0.0
                 self.last_short_entry = None
                 self.logger.info(f"Closed all {count} SHORT positions")
 
@@ -169,13 +184,10 @@ class PositionManager:
             Average entry price or None if no positions
         """
         with self._lock:
-            positions = self.long_positions if side == 'Buy' else self.short_positions
-
-            if not positions:
-                return None
-
-            total_quantity = sum(p.quantity for p in positions)
-            weighted_sum = sum(p.entry_price * p.quantity for p in positions)
+            if side == 'Buy':
+                total_quantity, weighted_sum = self._long_qty, self._long_notional
+            else:
+                total_quantity, weighted_sum = self._short_qty, self._short_notional
 
             return weighted_sum / total_quantity if total_quantity > 0 else None
 
@@ -190,8 +202,7 @@ class PositionManager:
             Total quantity (rounded to avoid floating point errors)
         """
         with self._lock:
-            positions = self.long_positions if side == 'Buy' else self.short_positions
-            total = sum(p.quantity for p in positions)
+            total = self._long_qty if side == 'Buy' else self._short_qty
 
             # Round to 8 decimal places to avoid floating point errors like 2.4000000000000004
             # For crypto, 8 decimals is standard precision
@@ -3,11 +3,15 @@
 import time
 import logging
 import threading
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from ..exchange.bybit_client import BybitClient
 from config.constants import TradingConstants
 
 
+class BalanceFetchError(RuntimeError):
+    """Raised when balance cannot be fetched from exchange REST API"""
+
+
 class BalanceManager:
     """
     Centralized balance management with WebSocket-first approach
@@ -52,6 +56,7 @@ class BalanceManager:
 
         Raises:
             RuntimeError: If balance not available
+            BalanceFetchError: If force_refresh fails to fetch balance from exchange
         """
         if force_refresh:
             # Force refresh only at startup before WebSocket is connected
@@ -131,6 +136,18 @@ class BalanceManager:
         with self._lock:
             return self._cached_full_data or {}
 
+    def snapshot(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Get cached balance and MM Rate together under a single lock
+
+        Unlike get_available_balance(), does not raise before the first update.
+
+        Returns:
+            (available balance in USDT or None, MM Rate as percentage or None)
+        """
+        with self._lock:
+            return self._cached_balance, self._cached_mm_rate
+
     def update_from_websocket(
         self,
         balance: float,
@@ -232,4 +249,4 @@ class BalanceManager:
 
         except Exception as e:
             self.logger.error(f"Failed to get balance from API: {e}")
-            raise RuntimeError(f"Cannot get balance from exchange: {e}") from e
+            raise BalanceFetchError(f"Cannot get balance from exchange: {e}") from e
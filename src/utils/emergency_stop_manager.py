@@ -16,11 +16,12 @@ JSON structure:
 }
 """
 
-import json
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 import logging
 
+import orjson
+
 
 class EmergencyStopManager:
     """
@@ -33,6 +34,9 @@ class EmergencyStopManager:
 
     DATA_DIR = Path("data")
 
+    # Resolved file paths keyed by (DATA_DIR, account_id)
+    _file_path_cache: Dict[Tuple[Path, int], Path] = {}
+
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
         Initialize EmergencyStopManager
@@ -42,19 +46,27 @@ class EmergencyStopManager:
         """
         self.logger = logger or logging.getLogger(__name__)
 
-    @staticmethod
-    def get_file_path(account_id: int) -> Path:
+    @classmethod
+    def get_file_path(cls, account_id: int) -> Path:
         """
         Get emergency stop file path for account
 
+        Paths are memoized per (DATA_DIR, account_id), so changing DATA_DIR
+        never returns a stale path.
+
         Args:
             account_id: Account ID (1-999)
 
         Returns:
             Path to emergency stop file (e.g., data/.001_emergency_stop)
         """
-        id_str = f"{account_id:03d}"
-        return EmergencyStopManager.DATA_DIR / f".{id_str}_emergency_stop"
+        key = (cls.DATA_DIR, account_id)
+        file_path = cls._file_path_cache.get(key)
+        if file_path is None:
+            id_str = f"{account_id:03d}"
+            file_path = cls.DATA_DIR / f".{id_str}_emergency_stop"
+            cls._file_path_cache[key] = file_path
+        return file_path
 
     @staticmethod
     def exists(account_id: int) -> bool:
@@ -82,13 +94,10 @@ class EmergencyStopManager:
         """
         file_path = EmergencyStopManager.get_file_path(account_id)
 
-        if not file_path.exists():
-            return None
-
+        # EAFP: a missing file surfaces as FileNotFoundError (an IOError)
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            return orjson.loads(file_path.read_bytes())
+        except (orjson.JSONDecodeError, IOError):
             return None
 
     def create(
@@ -125,8 +134,7 @@ class EmergencyStopManager:
             flag_content.update(additional_data)
 
         # Write file
-        with open(file_path, 'w') as f:
-            json.dump(flag_content, f, indent=2)
+        file_path.write_bytes(orjson.dumps(flag_content, option=orjson.OPT_INDENT_2))
 
         id_str = f"{account_id:03d}"
         self.logger.critical(
@@ -155,30 +163,28 @@ class EmergencyStopManager:
         id_str = f"{account_id:03d}"
         file_path = EmergencyStopManager.get_file_path(account_id)
 
-        if not file_path.exists():
-            return
-
-        # Try to read file data
+        # Read file data (no file means no emergency stop)
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-
-            raise RuntimeError(
-                f"❌ Account {id_str} ({account_name}) has emergency stop flag!\n"
-                f"   File: {file_path}\n"
-                f"   Timestamp: {data.get('timestamp', 'unknown')}\n"
-                f"   Reason: {data.get('reason', 'unknown')}\n"
-                f"   Symbol: {data.get('symbol', 'N/A')}\n"
-                f"\n"
-                f"   Fix issues and remove file:\n"
-                f"   rm {file_path}"
-            )
-        except json.JSONDecodeError:
+            data = orjson.loads(file_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except orjson.JSONDecodeError:
             raise RuntimeError(
                 f"❌ Account {id_str} has corrupted emergency stop file: {file_path}\n"
                 f"   Remove it manually: rm {file_path}"
             )
 
+        raise RuntimeError(
+            f"❌ Account {id_str} ({account_name}) has emergency stop flag!\n"
+            f"   File: {file_path}\n"
+            f"   Timestamp: {data.get('timestamp', 'unknown')}\n"
+            f"   Reason: {data.get('reason', 'unknown')}\n"
+            f"   Symbol: {data.get('symbol', 'N/A')}\n"
+            f"\n"
+            f"   Fix issues and remove file:\n"
+            f"   rm {file_path}"
+        )
+
     @staticmethod
     def remove(account_id: int):
         """
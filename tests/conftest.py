@@ -1,34 +1,63 @@
 """Pytest fixtures and configuration for sol-trader tests"""
 
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock
 import sys
+import types
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+
+class _StubPybitClient:
+    """Stand-in for pybit HTTP/WebSocket (tests always patch or mock these)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+# Tests never talk to the exchange, so skip pybit's heavy import chain
+# (requests, signing, websocket-client) by registering a lightweight stub.
+_pybit_unified = types.ModuleType('pybit.unified_trading')
+_pybit_unified.HTTP = type('HTTP', (_StubPybitClient,), {})
+_pybit_unified.WebSocket = type('WebSocket', (_StubPybitClient,), {})
+sys.modules.setdefault('pybit', types.ModuleType('pybit'))
+sys.modules.setdefault('pybit.unified_trading', _pybit_unified)
+
 from src.strategy.position_manager import PositionManager, Position
 from src.exchange.bybit_client import BybitClient
 from src.strategy.grid_strategy import GridStrategy
 from src.analytics.metrics_tracker import MetricsTracker
 
 
+# Sample strategy configuration, built once; read-only so no test can leak changes into others
+_SAMPLE_CONFIG = types.MappingProxyType({
+    'symbol': 'SOLUSDT',
+    'category': 'linear',
+    'leverage': 100,
+    'initial_position_size_usd': 1.0,
+    'grid_step_percent': 1.0,
+    'averaging_multiplier': 2.0,
+    'take_profit_percent': 1.0,
+    'max_grid_levels_per_side': 10,
+    'liquidation_buffer': 0.5,
+    'max_total_exposure': 1000.0
+})
+
+
+def pytest_configure(config):
+    """Register custom markers (kept here so runs without pytest-xdist stay warning-free)"""
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): keep tests on one pytest-xdist worker (use with --dist=loadgroup)"
+    )
+
+
 @pytest.fixture
 def sample_config():
-    """Sample strategy configuration"""
-    return {
-        'symbol': 'SOLUSDT',
-        'category': 'linear',
-        'leverage': 100,
-        'initial_position_size_usd': 1.0,
-        'grid_step_percent': 1.0,
-        'averaging_multiplier': 2.0,
-        'take_profit_percent': 1.0,
-        'max_grid_levels_per_side': 10,
-        'liquidation_buffer': 0.5,
-        'max_total_exposure': 1000.0
-    }
+    """Sample strategy configuration (read-only - copy before modifying)"""
+    return _SAMPLE_CONFIG
 
 
 @pytest.fixture
@@ -37,14 +66,22 @@ def position_manager():
     return PositionManager(leverage=100, symbol='SOLUSDT', enable_state_persistence=False)
 
 
+@pytest.fixture(scope="module")
+def _bybit_client_template():
+    """Spec'd BybitClient mock built once per module and reset by mock_bybit_client"""
+    client = Mock(spec=BybitClient)
+    client.session = Mock()
+    return client
+
+
 @pytest.fixture
-def mock_bybit_client():
+def mock_bybit_client(_bybit_client_template):
     """Mock Bybit client for testing"""
-    client = Mock(spec=BybitClient)
+    client = _bybit_client_template
+    client.reset_mock(return_value=True, side_effect=True)
 
     # Mock session for instrument info
-    mock_session = Mock()
-    mock_session.get_instruments_info = Mock(return_value={
+    client.session.get_instruments_info.return_value = {
         'retCode': 0,
         'result': {
             'list': [{
@@ -56,23 +93,22 @@ def mock_bybit_client():
                 }
             }]
         }
-    })
-    client.session = mock_session
+    }
 
     # Mock common methods
-    client.set_leverage = Mock(return_value=True)
-    client.get_ticker = Mock(return_value={'lastPrice': '100.0'})
-    client.get_wallet_balance = Mock(return_value={
+    client.set_leverage.return_value = True
+    client.get_ticker.return_value = {'lastPrice': '100.0'}
+    client.get_wallet_balance.return_value = {
         'list': [{'totalEquity': '1000.0'}]
-    })
-    client.get_active_position = Mock(return_value=None)
-    client.place_order = Mock(return_value={
+    }
+    client.get_active_position.return_value = None
+    client.place_order.return_value = {
         'orderId': 'test_order_123',
         'orderStatus': 'Filled'
-    })
-    client.place_tp_order = Mock(return_value='tp_order_123')
-    client.cancel_order = Mock(return_value=True)
-    client.close_position = Mock(return_value=True)
+    }
+    client.place_tp_order.return_value = 'tp_order_123'
+    client.cancel_order.return_value = True
+    client.close_position.return_value = True
 
     return client
 
@@ -105,6 +141,20 @@ def grid_strategy(mock_bybit_client, position_manager, sample_config, mock_metri
     )
 
 
+@pytest.fixture
+def gs_with_long(grid_strategy, position_manager):
+    """GridStrategy with one initial LONG position (0.1 @ 100)"""
+    position_manager.add_position('Buy', 100.0, 0.1, 0)
+    return grid_strategy
+
+
+@pytest.fixture
+def gs_with_both(gs_with_long, position_manager):
+    """GridStrategy with initial LONG and SHORT positions (0.1 @ 100 each)"""
+    position_manager.add_position('Sell', 100.0, 0.1, 0)
+    return gs_with_long
+
+
 @pytest.fixture
 def sample_long_position():
     """Sample LONG position"""
@@ -559,40 +559,72 @@ class TestPhase7PositionBalancing:
 class TestIntegration:
     """Integration tests for full workflow scenarios"""
 
-    def test_full_workflow_early_freeze_to_panic(self, trading_account, mock_balance_manager):
-        """Test complete workflow: Normal → Early Freeze → Panic → Recovery"""
+    @pytest.fixture
+    def seeded_account(self, trading_account, mock_balance_manager):
+        """Initialized account with one LONG position per strategy"""
         trading_account.initialize()
 
-        # Setup strategies
         for strategy in trading_account.strategies.values():
             strategy.balance_manager = mock_balance_manager
             strategy.current_price = 100.0
             strategy.pm.add_position('Buy', 100.0, 1.0, 0)
 
-        # Step 1: Trigger Early Freeze
-        mock_balance_manager.get_available_balance.return_value = 15.0
-        should_freeze, reason = trading_account.check_early_freeze_trigger()
-        if should_freeze:
-            trading_account.freeze_all_averaging(reason)
-
-        assert trading_account.averaging_frozen
-
-        # Step 2: Trigger Panic Mode
-        mock_balance_manager.get_available_balance.return_value = 5.0
-        triggered, reason = trading_account.check_panic_trigger_low_im()
-        if triggered:
-            trading_account.enter_panic_mode(reason)
-
-        assert trading_account.panic_mode
-        assert trading_account.averaging_frozen
-
-        # Step 3: Recovery
-        mock_balance_manager.get_available_balance.return_value = 100.0
-        should_freeze, _ = trading_account.check_early_freeze_trigger()
-        if not should_freeze and not trading_account.panic_mode:
-            trading_account.unfreeze_all_averaging()
-
-        # Would need to clear panic mode manually or via counter-trend TP
+        return trading_account
+
+    @staticmethod
+    def _advance(trading_account, step):
+        """Apply one workflow transition: 'freeze', 'panic' or 'recover'"""
+        if step == 'freeze':
+            should_freeze, reason = trading_account.check_early_freeze_trigger()
+            if should_freeze:
+                trading_account.freeze_all_averaging(reason)
+        elif step == 'panic':
+            triggered, reason = trading_account.check_panic_trigger_low_im()
+            if triggered:
+                trading_account.enter_panic_mode(reason)
+        elif step == 'recover':
+            should_freeze, _ = trading_account.check_early_freeze_trigger()
+            if not should_freeze and not trading_account.panic_mode:
+                trading_account.unfreeze_all_averaging()
+
+    @pytest.mark.parametrize(
+        "step,start_frozen,start_panic,balance,expected_frozen,expected_panic",
+        [
+            # Normal → Early Freeze
+            ('freeze', False, False, 15.0, True, False),
+            # Early Freeze → Panic
+            ('panic', True, False, 5.0, True, True),
+        ],
+        ids=['normal_to_freeze', 'freeze_to_panic'],
+    )
+    def test_full_workflow_early_freeze_to_panic(
+        self, seeded_account, mock_balance_manager,
+        step, start_frozen, start_panic, balance, expected_frozen, expected_panic
+    ):
+        """Test workflow transitions: Normal → Early Freeze → Panic → Recovery"""
+        seeded_account.averaging_frozen = start_frozen
+        seeded_account.panic_mode = start_panic
+        mock_balance_manager.get_available_balance.return_value = balance
+
+        self._advance(seeded_account, step)
+
+        assert seeded_account.averaging_frozen == expected_frozen
+        assert seeded_account.panic_mode == expected_panic
+
+    def test_full_workflow_panic_blocks_recovery(self, seeded_account):
+        """Test Panic → Recovery attempt: panic must be cleared manually or via counter-trend TP"""
+        seeded_account.averaging_frozen = True
+        seeded_account.panic_mode = True
+
+        # Freeze trigger has cleared (IM recovered), so only panic mode can block the unfreeze
+        with patch.object(seeded_account, 'check_early_freeze_trigger', return_value=(False, "")) as freeze_check, \
+                patch.object(seeded_account, 'unfreeze_all_averaging') as unfreeze:
+            self._advance(seeded_account, 'recover')
+
+        freeze_check.assert_called_once_with()
+        unfreeze.assert_not_called()
+        assert seeded_account.averaging_frozen is True
+        assert seeded_account.panic_mode is True
 
     def test_multi_symbol_reserve_checking(self, trading_account, mock_balance_manager):
         """Test reserve checking works across multiple symbols"""
@@ -1,24 +1,85 @@
 """Tests for BalanceManager utility (WebSocket-based)"""
 
+import re
 import pytest
-from unittest.mock import Mock, MagicMock
-from src.utils.balance_manager import BalanceManager
+from types import SimpleNamespace
+from unittest.mock import Mock
+from src.exchange.bybit_client import BybitClient
+from src.utils.balance_manager import BalanceManager, BalanceFetchError
+
+# Keep this module on a single pytest-xdist worker (pytest -n auto --dist=loadgroup)
+pytestmark = pytest.mark.xdist_group("balance_unit")
+
+
+# Expected error message (compiled once)
+_NO_WS_RE = re.compile("Balance not available - WebSocket not yet connected")
+
+# Wallet responses (shared, never mutated by tests)
+_DEFAULT_WALLET_RESPONSE = {
+    'list': [{
+        'accountType': 'UNIFIED',
+        'totalAvailableBalance': '1000.50',
+        'accountMMRate': '0.255'  # Decimal format (will be * 100 = 25.5%)
+    }]
+}
+
+_INVALID_BALANCE_RESPONSE = {
+    'list': [{
+        'accountType': 'UNIFIED',
+        'totalAvailableBalance': 'invalid',
+        'accountMMRate': '0.255'
+    }]
+}
+
+_MISSING_BALANCE_RESPONSE = {
+    'list': [{
+        'accountType': 'UNIFIED',
+        'accountMMRate': '0.255'
+        # Missing totalAvailableBalance
+    }]
+}
+
+_MISSING_MM_RATE_RESPONSE = {
+    'list': [{
+        'accountType': 'UNIFIED',
+        'totalAvailableBalance': '1000.00'
+        # No accountMMRate field
+    }]
+}
+
+_EMPTY_MM_RATE_RESPONSE = {
+    'list': [{
+        'accountType': 'UNIFIED',
+        'totalAvailableBalance': '1000.00',
+        'accountMMRate': ''  # Empty string
+    }]
+}
+
+
+@pytest.fixture(scope="module")
+def _mock_client_template():
+    """Mock Bybit client built once per module"""
+    client = Mock(spec=BybitClient)
+    client.get_wallet_balance.return_value = _DEFAULT_WALLET_RESPONSE
+    return client
+
+
+@pytest.fixture(scope="class")
+def readonly_balance_manager(_mock_client_template):
+    """BalanceManager shared by tests that never update or refresh it"""
+    return BalanceManager(client=_mock_client_template)
 
 
 class TestBalanceManager:
     """Test BalanceManager utility class (WebSocket-based)"""
 
     @pytest.fixture
-    def mock_client(self):
-        """Create mock Bybit client"""
-        client = Mock()
-        client.get_wallet_balance = MagicMock(return_value={
-            'list': [{
-                'accountType': 'UNIFIED',
-                'totalAvailableBalance': '1000.50',
-                'accountMMRate': '0.255'  # Decimal format (will be * 100 = 25.5%)
-            }]
-        })
+    def mock_client(self, _mock_client_template):
+        """Reset the shared mock Bybit client to its default state"""
+        client = _mock_client_template
+        client.reset_mock()
+        client.get_wallet_balance.side_effect = None
+        client.get_wallet_balance.return_value = _DEFAULT_WALLET_RESPONSE
         return client
 
     @pytest.fixture
@@ -35,18 +96,34 @@ class TestBalanceManager:
         assert manager._cached_mm_rate is None
         assert manager._last_update_time == 0
 
-    def test_get_balance_without_websocket_raises_error(self, balance_manager):
+    def test_get_balance_without_websocket_raises_error(self, readonly_balance_manager):
         """Test that getting balance without WebSocket update raises error"""
-        with pytest.raises(RuntimeError, match="Balance not available - WebSocket not yet connected"):
-            balance_manager.get_available_balance()
-
-    def test_force_refresh_at_startup(self, balance_manager, mock_client):
-        """Test force_refresh=True fetches from REST API (startup only)"""
-        balance = balance_manager.get_available_balance(force_refresh=True)
-
-        assert balance == 1000.50
-        assert balance_manager._cached_balance == 1000.50
-        assert mock_client.get_wallet_balance.call_count == 1
+        with pytest.raises(RuntimeError, match=_NO_WS_RE):
+            readonly_balance_manager.get_available_balance()
+
+    @pytest.mark.parametrize("response,call,expect_raise,expected", [
+        (_DEFAULT_WALLET_RESPONSE, "balance", False, 1000.50),
+        (_INVALID_BALANCE_RESPONSE, "balance", True, None),
+        (_MISSING_BALANCE_RESPONSE, "balance", False, 0.0),  # Missing field defaults to 0
+        (_MISSING_MM_RATE_RESPONSE, "mm_rate", False, None),
+        (_EMPTY_MM_RATE_RESPONSE, "mm_rate", False, None),
+        (_DEFAULT_WALLET_RESPONSE, "mm_rate", False, pytest.approx(25.5)),  # '0.255' * 100
+    ], ids=[
+        'balance_at_startup', 'invalid_balance', 'missing_balance',
+        'missing_mm_rate', 'empty_mm_rate', 'mm_rate',
+    ])
+    def test_force_refresh_variants(self, balance_manager, mock_client, response, call, expect_raise, expected):
+        """Test force_refresh=True fetches from REST API and handles response formats"""
+        mock_client.get_wallet_balance.return_value = response
+        getter = balance_manager.get_available_balance if call == "balance" else balance_manager.get_mm_rate
+
+        if expect_raise:
+            with pytest.raises(BalanceFetchError):
+                getter(force_refresh=True)
+        else:
+            assert getter(force_refresh=True) == expected
+
+        mock_client.get_wallet_balance.assert_called_once()
 
     def test_update_from_websocket(self, balance_manager):
         """Test updating balance from WebSocket"""
@@ -54,33 +131,22 @@ class TestBalanceManager:
         balance_manager.update_from_websocket(balance=1234.56, mm_rate=15.5)
 
         # Should update cache
-        assert balance_manager.get_available_balance() == 1234.56
-        assert balance_manager.get_mm_rate() == 15.5
+        assert balance_manager.snapshot() == (1234.56, 15.5)
 
     def test_update_from_websocket_without_mm_rate(self, balance_manager):
         """Test WebSocket update without MM Rate"""
         # Simulate WebSocket update without MM Rate
         balance_manager.update_from_websocket(balance=500.00, mm_rate=None)
 
-        assert balance_manager.get_available_balance() == 500.00
-        assert balance_manager.get_mm_rate() is None
+        assert balance_manager.snapshot() == (500.00, None)
 
-    def test_multiple_websocket_updates(self, balance_manager):
-        """Test multiple WebSocket updates in sequence"""
-        # First update
-        balance_manager.update_from_websocket(balance=100.0, mm_rate=10.0)
-        assert balance_manager.get_available_balance() == 100.0
-        assert balance_manager.get_mm_rate() == 10.0
-
-        # Second update
-        balance_manager.update_from_websocket(balance=200.0, mm_rate=20.0)
-        assert balance_manager.get_available_balance() == 200.0
-        assert balance_manager.get_mm_rate() == 20.0
+    @pytest.mark.parametrize("balance,mm_rate", [(100.0, 10.0), (200.0, 20.0), (300.0, 30.0)])
+    def test_multiple_websocket_updates(self, balance_manager, balance, mm_rate):
+        """Test that the latest WebSocket update replaces the previous one"""
+        balance_manager.update_from_websocket(balance=1.0, mm_rate=1.0)
+        balance_manager.update_from_websocket(balance=balance, mm_rate=mm_rate)
 
-        # Third update
-        balance_manager.update_from_websocket(balance=300.0, mm_rate=30.0)
-        assert balance_manager.get_available_balance() == 300.0
-        assert balance_manager.get_mm_rate() == 30.0
+        assert balance_manager.snapshot() == (balance, mm_rate)
 
     def test_get_mm_rate_after_websocket_update(self, balance_manager):
         """Test getting MM rate after WebSocket update"""
@@ -89,22 +155,19 @@ class TestBalanceManager:
         mm_rate = balance_manager.get_mm_rate()
         assert mm_rate == 25.5
 
-    def test_get_mm_rate_without_websocket_returns_none(self, balance_manager):
+    def test_snapshot_without_websocket(self, readonly_balance_manager):
+        """Test snapshot before WebSocket connection returns (None, None) instead of raising"""
+        assert readonly_balance_manager.snapshot() == (None, None)
+
+    def test_get_mm_rate_without_websocket_returns_none(self, readonly_balance_manager):
         """Test that MM rate returns None when WebSocket hasn't updated yet"""
         # No force_refresh, just check cached value
-        mm_rate = balance_manager.get_mm_rate()
+        mm_rate = readonly_balance_manager.get_mm_rate()
         assert mm_rate is None
 
-    def test_force_refresh_mm_rate(self, balance_manager, mock_client):
-        """Test force refresh for MM rate"""
-        mm_rate = balance_manager.get_mm_rate(force_refresh=True)
-
-        assert mm_rate == 25.5
-        assert mock_client.get_wallet_balance.call_count == 1
-
-    def test_get_full_balance_data_without_websocket(self, balance_manager):
+    def test_get_full_balance_data_without_websocket(self, readonly_balance_manager):
         """Test full balance data before WebSocket connection"""
-        data = balance_manager.get_full_balance_data()
+        data = readonly_balance_manager.get_full_balance_data()
         assert data == {}
 
     def test_get_full_balance_data_force_refresh(self, balance_manager, mock_client):
@@ -113,74 +176,21 @@ class TestBalanceManager:
 
         assert 'accountType' in data
         assert data['accountType'] == 'UNIFIED'
-        assert mock_client.get_wallet_balance.call_count == 1
+        mock_client.get_wallet_balance.assert_called_once()
 
     def test_api_error_handling_on_force_refresh(self, balance_manager, mock_client):
         """Test handling of API errors on force refresh"""
         mock_client.get_wallet_balance.side_effect = RuntimeError("API Error")
 
-        with pytest.raises(RuntimeError, match="Cannot get balance from exchange"):
-            balance_manager.get_available_balance(force_refresh=True)
-
-    def test_invalid_balance_format_on_force_refresh(self, balance_manager, mock_client):
-        """Test handling of invalid balance format on force refresh"""
-        mock_client.get_wallet_balance.return_value = {
-            'list': [{
-                'accountType': 'UNIFIED',
-                'totalAvailableBalance': 'invalid',
-                'accountMMRate': '0.255'
-            }]
-        }
-
-        with pytest.raises(RuntimeError, match="Cannot get balance from exchange"):
+        with pytest.raises(BalanceFetchError):
             balance_manager.get_available_balance(force_refresh=True)
 
-    def test_missing_balance_field_on_force_refresh(self, balance_manager, mock_client):
-        """Test handling of missing balance field on force refresh"""
-        mock_client.get_wallet_balance.return_value = {
-            'list': [{
-                'accountType': 'UNIFIED',
-                'accountMMRate': '0.255'
-                # Missing totalAvailableBalance
-            }]
-        }
-
-        # Should use 0 as default
-        balance = balance_manager.get_available_balance(force_refresh=True)
-        assert balance == 0.0
-
-    def test_missing_mm_rate_on_force_refresh(self, balance_manager, mock_client):
-        """Test handling of missing MM rate on force refresh"""
-        mock_client.get_wallet_balance.return_value = {
-            'list': [{
-                'accountType': 'UNIFIED',
-                'totalAvailableBalance': '1000.00'
-                # No accountMMRate field
-            }]
-        }
-
-        mm_rate = balance_manager.get_mm_rate(force_refresh=True)
-        assert mm_rate is None
-
-    def test_empty_string_mm_rate_on_force_refresh(self, balance_manager, mock_client):
-        """Test handling of empty string MM rate on force refresh"""
-        mock_client.get_wallet_balance.return_value = {
-            'list': [{
-                'accountType': 'UNIFIED',
-                'totalAvailableBalance': '1000.00',
-                'accountMMRate': ''  # Empty string
-            }]
-        }
-
-        mm_rate = balance_manager.get_mm_rate(force_refresh=True)
-        assert mm_rate is None
-
     def test_websocket_first_approach(self, balance_manager, mock_client):
         """Test WebSocket-first approach: REST API only for startup"""
         # Startup: force refresh
         balance1 = balance_manager.get_available_balance(force_refresh=True)
         assert balance1 == 1000.50
-        assert mock_client.get_wallet_balance.call_count == 1
+        mock_client.get_wallet_balance.assert_called_once()
 
         # After startup: all updates via WebSocket
         balance_manager.update_from_websocket(balance=2000.0, mm_rate=50.0)
@@ -188,11 +198,13 @@ class TestBalanceManager:
         assert balance2 == 2000.0
 
         # No additional REST API calls
-        assert mock_client.get_wallet_balance.call_count == 1
+        mock_client.get_wallet_balance.assert_called_once()
 
-    def test_websocket_update_timestamp(self, balance_manager):
+    def test_websocket_update_timestamp(self, balance_manager, monkeypatch):
         """Test that WebSocket updates record timestamp"""
-        import time
+        # Controlled clock instead of real sleeps
+        clock = iter([1000.5, 1001.0]).__next__
+        monkeypatch.setattr('src.utils.balance_manager.time', SimpleNamespace(time=clock))
 
         initial_time = balance_manager._last_update_time
         assert initial_time == 0
@@ -200,12 +212,9 @@ class TestBalanceManager:
         # First update
         balance_manager.update_from_websocket(balance=1000.0, mm_rate=10.0)
         time1 = balance_manager._last_update_time
-        assert time1 > initial_time
-
-        # Wait a bit
-        time.sleep(0.1)
+        assert time1 == 1000.5
 
         # Second update
         balance_manager.update_from_websocket(balance=2000.0, mm_rate=20.0)
         time2 = balance_manager._last_update_time
-        assert time2 > time1
+        assert time2 == 1001.0
@@ -1,14 +1,216 @@
 """Unit tests for BybitClient with mocked API calls"""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 from src.exchange.bybit_client import BybitClient
 
+# Keep this module on a single pytest-xdist worker (pytest -n auto --dist=loadgroup)
+pytestmark = pytest.mark.xdist_group("bybit_unit")
+
+
+# Canned pybit responses (read-only, shared by all tests)
+_SET_LEVERAGE_RESP = {
+    'retCode': 0,
+    'retMsg': 'OK'
+}
+
+_MARKET_ORDER_RESP = {
+    'retCode': 0,
+    'result': {
+        'orderId': '12345',
+        'orderStatus': 'Filled'
+    }
+}
+
+_ORDER_RESP = {
+    'retCode': 0,
+    'result': {'orderId': '12345'}
+}
+
+_TP_ORDER_RESP = {
+    'retCode': 0,
+    'result': {'orderId': 'tp_123'}
+}
+
+_CLOSE_ORDER_RESP = {
+    'retCode': 0,
+    'result': {'orderId': 'close_123'}
+}
+
+_POSITION_RESP = {
+    'retCode': 0,
+    'result': {
+        'list': [
+            {
+                'symbol': 'SOLUSDT',
+                'side': 'Buy',
+                'size': '0.5',
+                'avgPrice': '100.0'
+            }
+        ]
+    }
+}
+
+_EMPTY_LIST_RESP = {
+    'retCode': 0,
+    'result': {'list': []}
+}
+
+_TICKER_RESP = {
+    'retCode': 0,
+    'result': {
+        'list': [
+            {
+                'symbol': 'SOLUSDT',
+                'lastPrice': '123.45',
+                'bid1Price': '123.40',
+                'ask1Price': '123.50'
+            }
+        ]
+    }
+}
+
+_WALLET_RESP = {
+    'retCode': 0,
+    'result': {
+        'list': [
+            {
+                'accountType': 'UNIFIED',
+                'totalEquity': '1000.50',
+                'totalAvailableBalance': '950.00'
+            }
+        ]
+    }
+}
+
+_API_ERROR_RESP = {
+    'retCode': 10001,
+    'retMsg': 'API error'
+}
+
+_CLOSED_PNL_RESP = {
+    'retCode': 0,
+    'result': {
+        'list': [
+            {
+                'closedPnl': '1.5',
+                'openFee': '0.06',
+                'closeFee': '0.06',
+                'avgEntryPrice': '100',
+                'avgExitPrice': '101.5',
+                'qty': '1.0',
+                'symbol': 'SOLUSDT',
+                'side': 'Buy'
+            }
+        ]
+    }
+}
+
+_TX_LOG_RESP = {
+    'retCode': 0,
+    'result': {
+        'list': [
+            {
+                'type': 'SETTLEMENT',
+                'symbol': 'SOLUSDT',
+                'category': 'linear',
+                'funding': '-0.003',
+                'transactionTime': '1696521600000'
+            }
+        ]
+    }
+}
+
+_TX_LOG_ALL_SYMBOLS_RESP = {
+    'retCode': 0,
+    'result': {
+        'list': [
+            {'type': 'SETTLEMENT', 'symbol': 'SOLUSDT'},
+            {'type': 'SETTLEMENT', 'symbol': 'BTCUSDT'}
+        ]
+    }
+}
+
+
+@pytest.fixture(scope="class")
+def _patched_http():
+    """pybit HTTP class patched once per test class"""
+    with patch('src.exchange.bybit_client.HTTP') as mock_http:
+        yield mock_http
+
+
+@pytest.fixture
+def mock_http(_patched_http):
+    """Patched pybit HTTP class with call history reset for each test"""
+    _patched_http.reset_mock()
+    return _patched_http
+
+
+# pybit HTTP session methods used by BybitClient
+_SESSION_METHODS = [
+    'cancel_order',
+    'get_closed_pnl',
+    'get_open_orders',
+    'get_order_history',
+    'get_positions',
+    'get_tickers',
+    'get_transaction_log',
+    'get_wallet_balance',
+    'place_order',
+    'set_leverage',
+    'switch_position_mode',
+]
+
+
+@pytest.fixture(scope="class")
+def client_template(_patched_http):
+    """BybitClient constructed once per test class"""
+    _patched_http.return_value = Mock(spec=_SESSION_METHODS)
+    return BybitClient('key', 'secret', demo=True)
+
+
+class _RaisingSession:
+    """Session stub whose every API method raises a network error"""
+
+    def __getattr__(self, name):
+        def _raise(*args, **kwargs):
+            raise Exception('Network error')
+        return _raise
+
+
+def _recording_stub(response=None, error=None):
+    """Plain function standing in for a session method; records call kwargs in .calls"""
+    calls = []
+
+    def method(**kwargs):
+        calls.append(kwargs)
+        if error is not None:
+            raise error
+        return response
+
+    method.calls = calls
+    return method
+
+
+@pytest.fixture
+def raising_client(client_template):
+    """Shared BybitClient bound to a session that always raises"""
+    client_template.session = _RaisingSession()
+    return client_template
+
+
+@pytest.fixture
+def mock_session_and_client(client_template):
+    """Fresh mock pybit session bound to the shared BybitClient"""
+    session = Mock(spec=_SESSION_METHODS)
+    client_template.session = session
+    yield session, client_template
+
 
 class TestBybitClientInitialization:
     """Tests for BybitClient initialization"""
 
-    @patch('src.exchange.bybit_client.HTTP')
     def test_initialization_demo(self, mock_http):
         """Test initialization with demo credentials"""
         client = BybitClient(
@@ -23,7 +225,6 @@ class TestBybitClientInitialization:
         call_kwargs = mock_http.call_args[1]
         assert call_kwargs.get('demo') is True
 
-    @patch('src.exchange.bybit_client.HTTP')
     def test_initialization_production(self, mock_http):
         """Test initialization with production credentials"""
         client = BybitClient(
@@ -39,17 +240,11 @@ class TestBybitClientInitialization:
 class TestSetLeverage:
     """Tests for set_leverage method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_set_leverage_success(self, mock_http):
+    def test_set_leverage_success(self, mock_session_and_client):
         """Test successful leverage setting"""
-        mock_session = MagicMock()
-        mock_session.set_leverage.return_value = {
-            'retCode': 0,
-            'retMsg': 'OK'
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.set_leverage.return_value = _SET_LEVERAGE_RESP
+
         result = client.set_leverage('SOLUSDT', 100, 'linear')
 
         assert result is not None
@@ -60,36 +255,20 @@ class TestSetLeverage:
             sellLeverage='100'
         )
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_set_leverage_error_handling(self, mock_http):
+    def test_set_leverage_error_handling(self, raising_client):
         """Test leverage setting error handling"""
-        mock_session = MagicMock()
-        mock_session.set_leverage.side_effect = Exception('API Error')
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-
         with pytest.raises(Exception):
-            client.set_leverage('SOLUSDT', 100, 'linear')
+            raising_client.set_leverage('SOLUSDT', 100, 'linear')
 
 
 class TestPlaceOrder:
     """Tests for place_order method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_place_market_order_buy(self, mock_http):
+    def test_place_market_order_buy(self, mock_session_and_client):
         """Test placing market buy order"""
-        mock_session = MagicMock()
-        mock_session.place_order.return_value = {
-            'retCode': 0,
-            'result': {
-                'orderId': '12345',
-                'orderStatus': 'Filled'
-            }
-        }
-        mock_http.return_value = mock_session
+        mock_session, client = mock_session_and_client
+        mock_session.place_order.return_value = _MARKET_ORDER_RESP
 
-        client = BybitClient('key', 'secret', demo=True)
         result = client.place_order(
             symbol='SOLUSDT',
             side='Buy',
@@ -105,17 +284,11 @@ class TestPlaceOrder:
         assert call_kwargs['orderType'] == 'Market'
         assert call_kwargs['qty'] == '0.1'
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_place_limit_order(self, mock_http):
+    def test_place_limit_order(self, mock_session_and_client):
         """Test placing limit order"""
-        mock_session = MagicMock()
-        mock_session.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': '12345'}
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.place_order.return_value = _ORDER_RESP
+
         result = client.place_order(
             symbol='SOLUSDT',
             side='Sell',
@@ -134,17 +307,11 @@ class TestPlaceOrder:
 class TestPlaceTPOrder:
     """Tests for place_tp_order method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_place_tp_order_long(self, mock_http):
+    def test_place_tp_order_long(self, mock_session_and_client):
         """Test placing TP order for LONG position"""
-        mock_session = MagicMock()
-        mock_session.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': 'tp_123'}
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.place_order.return_value = _TP_ORDER_RESP
+
         order_id = client.place_tp_order(
             symbol='SOLUSDT',
             side='Sell',  # Close LONG with Sell
@@ -163,43 +330,22 @@ class TestPlaceTPOrder:
 class TestGetActivePosition:
     """Tests for get_active_position method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_active_position_exists(self, mock_http):
+    def test_get_active_position_exists(self, mock_session_and_client):
         """Test getting active position when it exists"""
-        mock_session = MagicMock()
-        mock_session.get_positions.return_value = {
-            'retCode': 0,
-            'result': {
-                'list': [
-                    {
-                        'symbol': 'SOLUSDT',
-                        'side': 'Buy',
-                        'size': '0.5',
-                        'avgPrice': '100.0'
-                    }
-                ]
-            }
-        }
-        mock_http.return_value = mock_session
+        mock_session, client = mock_session_and_client
+        mock_session.get_positions.return_value = _POSITION_RESP
 
-        client = BybitClient('key', 'secret', demo=True)
         position = client.get_active_position('SOLUSDT', 'Buy', 'linear')
 
         assert position is not None
         assert position['size'] == '0.5'
         assert position['avgPrice'] == '100.0'
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_active_position_none(self, mock_http):
+    def test_get_active_position_none(self, mock_session_and_client):
         """Test getting active position when none exists"""
-        mock_session = MagicMock()
-        mock_session.get_positions.return_value = {
-            'retCode': 0,
-            'result': {'list': []}
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.get_positions.return_value = _EMPTY_LIST_RESP
+
         position = client.get_active_position('SOLUSDT', 'Buy', 'linear')
 
         assert position is None
@@ -208,26 +354,11 @@ class TestGetActivePosition:
 class TestGetTicker:
     """Tests for get_ticker method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_ticker_success(self, mock_http):
+    def test_get_ticker_success(self, mock_session_and_client):
         """Test getting ticker data"""
-        mock_session = MagicMock()
-        mock_session.get_tickers.return_value = {
-            'retCode': 0,
-            'result': {
-                'list': [
-                    {
-                        'symbol': 'SOLUSDT',
-                        'lastPrice': '123.45',
-                        'bid1Price': '123.40',
-                        'ask1Price': '123.50'
-                    }
-                ]
-            }
-        }
-        mock_http.return_value = mock_session
+        mock_session, client = mock_session_and_client
+        mock_session.get_tickers.return_value = _TICKER_RESP
 
-        client = BybitClient('key', 'secret', demo=True)
         ticker = client.get_ticker('SOLUSDT', 'linear')
 
         assert ticker is not None
@@ -237,25 +368,11 @@ class TestGetTicker:
 class TestGetWalletBalance:
     """Tests for get_wallet_balance method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_wallet_balance_success(self, mock_http):
+    def test_get_wallet_balance_success(self, mock_session_and_client):
         """Test getting wallet balance"""
-        mock_session = MagicMock()
-        mock_session.get_wallet_balance.return_value = {
-            'retCode': 0,
-            'result': {
-                'list': [
-                    {
-                        'accountType': 'UNIFIED',
-                        'totalEquity': '1000.50',
-                        'totalAvailableBalance': '950.00'
-                    }
-                ]
-            }
-        }
-        mock_http.return_value = mock_session
+        mock_session, client = mock_session_and_client
+        mock_session.get_wallet_balance.return_value = _WALLET_RESP
 
-        client = BybitClient('key', 'secret', demo=True)
         balance = client.get_wallet_balance()
 
         assert balance is not None
@@ -265,17 +382,11 @@ class TestGetWalletBalance:
 class TestCancelOrder:
     """Tests for cancel_order method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_cancel_order_success(self, mock_http):
+    def test_cancel_order_success(self, mock_session_and_client):
         """Test canceling an order"""
-        mock_session = MagicMock()
-        mock_session.cancel_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': '12345'}
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.cancel_order.return_value = _ORDER_RESP
+
         result = client.cancel_order('SOLUSDT', '12345', 'linear')
 
         assert result is not None
@@ -289,17 +400,11 @@ class TestCancelOrder:
 class TestClosePosition:
     """Tests for close_position method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_close_position_long(self, mock_http):
+    def test_close_position_long(self, mock_session_and_client):
         """Test closing LONG position"""
-        mock_session = MagicMock()
-        mock_session.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': 'close_123'}
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.place_order.return_value = _CLOSE_ORDER_RESP
+
         result = client.close_position('SOLUSDT', 'Buy', 0.5, 'linear')
 
         assert result is not None
@@ -308,17 +413,11 @@ class TestClosePosition:
         assert call_kwargs['side'] == 'Sell'
         assert call_kwargs['qty'] == '0.5'
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_close_position_short(self, mock_http):
+    def test_close_position_short(self, mock_session_and_client):
         """Test closing SHORT position"""
-        mock_session = MagicMock()
-        mock_session.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': 'close_456'}
-        }
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
+        mock_session, client = mock_session_and_client
+        mock_session.place_order.return_value = _CLOSE_ORDER_RESP
+
         result = client.close_position('SOLUSDT', 'Sell', 0.5, 'linear')
 
         assert result is not None
@@ -331,28 +430,18 @@ class TestClosePosition:
 class TestErrorHandling:
     """Tests for error handling"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_api_error_with_retry(self, mock_http):
+    def test_api_error_with_retry(self, raising_client):
         """Test API error handling"""
-        mock_session = MagicMock()
-        mock_session.place_order.side_effect = Exception('Network error')
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-
         with pytest.raises(Exception) as exc_info:
-            client.place_order('SOLUSDT', 'Buy', 0.1, 'Market', 'linear')
+            raising_client.place_order('SOLUSDT', 'Buy', 0.1, 'Market', 'linear')
 
         assert 'Network error' in str(exc_info.value)
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_invalid_response_handling(self, mock_http):
+    def test_invalid_response_handling(self, mock_session_and_client):
         """Test handling of invalid API responses"""
-        mock_session = MagicMock()
-        mock_session.get_ticker.return_value = None
-        mock_http.return_value = mock_session
+        mock_session, client = mock_session_and_client
+        mock_session.get_tickers.return_value = None
 
-        client = BybitClient('key', 'secret', demo=True)
         ticker = client.get_ticker('SOLUSDT', 'linear')
 
         # Should handle gracefully
@@ -362,169 +451,43 @@ class TestErrorHandling:
 class TestClosedPnL:
     """Tests for get_closed_pnl method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_closed_pnl_success(self, mock_http):
-        """Test successful closed PnL retrieval"""
-        mock_session = MagicMock()
-        mock_response = {
-            'retCode': 0,
-            'result': {
-                'list': [
-                    {
-                        'closedPnl': '1.5',
-                        'openFee': '0.06',
-                        'closeFee': '0.06',
-                        'avgEntryPrice': '100',
-                        'avgExitPrice': '101.5',
-                        'qty': '1.0',
-                        'symbol': 'SOLUSDT',
-                        'side': 'Buy'
-                    }
-                ]
-            }
-        }
-        mock_session.get_closed_pnl.return_value = mock_response
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_closed_pnl('SOLUSDT', limit=1)
-
-        assert len(records) == 1
-        assert records[0]['closedPnl'] == '1.5'
-        assert records[0]['openFee'] == '0.06'
-        assert records[0]['closeFee'] == '0.06'
-        mock_session.get_closed_pnl.assert_called_once_with(
-            category='linear',
-            symbol='SOLUSDT',
-            limit=1
-        )
-
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_closed_pnl_empty(self, mock_http):
-        """Test closed PnL with no records"""
-        mock_session = MagicMock()
-        mock_response = {
-            'retCode': 0,
-            'result': {'list': []}
-        }
-        mock_session.get_closed_pnl.return_value = mock_response
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_closed_pnl('SOLUSDT')
-
-        assert records == []
-
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_closed_pnl_failure(self, mock_http):
-        """Test closed PnL API failure"""
-        mock_session = MagicMock()
-        mock_response = {
-            'retCode': 10001,
-            'retMsg': 'API error'
-        }
-        mock_session.get_closed_pnl.return_value = mock_response
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_closed_pnl('SOLUSDT')
-
-        assert records == []
+    @pytest.mark.parametrize("response,error,expected", [
+        (_CLOSED_PNL_RESP, None, _CLOSED_PNL_RESP['result']['list']),
+        (_EMPTY_LIST_RESP, None, []),
+        (_API_ERROR_RESP, None, []),
+        (None, Exception('Network error'), []),
+    ], ids=['success', 'empty', 'api_error', 'exception'])
+    def test_get_closed_pnl(self, client_template, response, error, expected):
+        """Test closed PnL retrieval: records on success, [] on empty/failure/exception"""
+        get_closed_pnl = _recording_stub(response, error)
+        client_template.session = SimpleNamespace(get_closed_pnl=get_closed_pnl)
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_closed_pnl_exception(self, mock_http):
-        """Test closed PnL with exception"""
-        mock_session = MagicMock()
-        mock_session.get_closed_pnl.side_effect = Exception('Network error')
-        mock_http.return_value = mock_session
+        records = client_template.get_closed_pnl('SOLUSDT', limit=1)
 
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_closed_pnl('SOLUSDT')
-
-        assert records == []
+        assert records == expected
+        assert get_closed_pnl.calls == [
+            {'category': 'linear', 'symbol': 'SOLUSDT', 'limit': 1}
+        ]
 
 
 class TestTransactionLog:
     """Tests for get_transaction_log method"""
 
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_transaction_log_success(self, mock_http):
-        """Test successful transaction log retrieval"""
-        mock_session = MagicMock()
-        mock_response = {
-            'retCode': 0,
-            'result': {
-                'list': [
-                    {
-                        'type': 'SETTLEMENT',
-                        'symbol': 'SOLUSDT',
-                        'category': 'linear',
-                        'funding': '-0.003',
-                        'transactionTime': '1696521600000'
-                    }
-                ]
-            }
-        }
-        mock_session.get_transaction_log.return_value = mock_response
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_transaction_log(
-            symbol='SOLUSDT',
-            type='SETTLEMENT',
-            limit=10
-        )
-
-        assert len(records) == 1
-        assert records[0]['type'] == 'SETTLEMENT'
-        assert records[0]['funding'] == '-0.003'
-        mock_session.get_transaction_log.assert_called_once()
-
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_transaction_log_all_symbols(self, mock_http):
-        """Test transaction log for all symbols"""
-        mock_session = MagicMock()
-        mock_response = {
-            'retCode': 0,
-            'result': {
-                'list': [
-                    {'type': 'SETTLEMENT', 'symbol': 'SOLUSDT'},
-                    {'type': 'SETTLEMENT', 'symbol': 'BTCUSDT'}
-                ]
-            }
-        }
-        mock_session.get_transaction_log.return_value = mock_response
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_transaction_log()
-
-        assert len(records) == 2
-
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_transaction_log_failure(self, mock_http):
-        """Test transaction log API failure"""
-        mock_session = MagicMock()
-        mock_response = {
-            'retCode': 10001,
-            'retMsg': 'API error'
-        }
-        mock_session.get_transaction_log.return_value = mock_response
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_transaction_log()
-
-        assert records == []
-
-    @patch('src.exchange.bybit_client.HTTP')
-    def test_get_transaction_log_exception(self, mock_http):
-        """Test transaction log with exception"""
-        mock_session = MagicMock()
-        mock_session.get_transaction_log.side_effect = Exception('Network error')
-        mock_http.return_value = mock_session
-
-        client = BybitClient('key', 'secret', demo=True)
-        records = client.get_transaction_log(symbol='SOLUSDT')
-
-        assert records == []
+    @pytest.mark.parametrize("kwargs,response,error,expected", [
+        (
+            {'symbol': 'SOLUSDT', 'type': 'SETTLEMENT', 'limit': 10},
+            _TX_LOG_RESP, None, _TX_LOG_RESP['result']['list']
+        ),
+        ({}, _TX_LOG_ALL_SYMBOLS_RESP, None, _TX_LOG_ALL_SYMBOLS_RESP['result']['list']),
+        ({}, _API_ERROR_RESP, None, []),
+        ({'symbol': 'SOLUSDT'}, None, Exception('Network error'), []),
+    ], ids=['success', 'all_symbols', 'api_error', 'exception'])
+    def test_get_transaction_log(self, client_template, kwargs, response, error, expected):
+        """Test transaction log retrieval: records on success, [] on failure/exception"""
+        get_transaction_log = _recording_stub(response, error)
+        client_template.session = SimpleNamespace(get_transaction_log=get_transaction_log)
+
+        records = client_template.get_transaction_log(**kwargs)
+
+        assert records == expected
+        assert len(get_transaction_log.calls) == 1
@@ -1,67 +1,126 @@
 """Tests for EmergencyStopManager utility"""
 
 import pytest
-import json
+import orjson
 import logging
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import Mock, patch
+from zoneinfo import ZoneInfo
+from unittest.mock import Mock
 from src.utils.emergency_stop_manager import EmergencyStopManager
 
 
+HEL = ZoneInfo('Europe/Helsinki')
+
+# Frozen "now" for emergency stop file timestamps
+_FIXED_TIME = datetime(2025, 1, 15, 10, 30, tzinfo=HEL)
+
+# Emergency stop file payloads, serialized once at import
+_VALID_DATA = {
+    "timestamp": "2025-01-15T10:30:00+02:00",
+    "account_id": 1,
+    "symbol": "DOGEUSDT",
+    "reason": "MM Rate exceeded threshold"
+}
+_VALID_PAYLOAD = orjson.dumps(_VALID_DATA)
+
+_VALIDATE_PAYLOAD = orjson.dumps({
+    "timestamp": "2025-01-15T10:30:00+02:00",
+    "account_id": 1,
+    "symbol": "DOGEUSDT",
+    "reason": "Test reason"
+})
+
+_MULTI_ACCOUNT_PAYLOADS = [
+    (account_id, orjson.dumps({"account_id": account_id, "reason": f"Test {account_id}"}))
+    for account_id in (1, 2, 5, 10)
+]
+
+
+class _StubLogger:
+    """Minimal logger stand-in; each level method records its calls"""
+
+    def __init__(self):
+        self.debug = Mock()
+        self.info = Mock()
+        self.warning = Mock()
+        self.error = Mock()
+        self.critical = Mock()
+
+
+@pytest.fixture(scope="session")
+def _base_dir(tmp_path_factory):
+    """Single temporary directory shared by the whole test session"""
+    return tmp_path_factory.mktemp("esm")
+
+
+@pytest.fixture(scope="module")
+def read_only_manager():
+    """EmergencyStopManager shared by tests that never create or remove files
+
+    Static methods resolve DATA_DIR at call time, so the per-test DATA_DIR
+    patch still applies to this shared instance.
+    """
+    return EmergencyStopManager(logger=_StubLogger())
+
+
 class TestEmergencyStopManager:
     """Test EmergencyStopManager utility class"""
 
     @pytest.fixture
-    def test_data_dir(self, tmp_path):
-        """Create temporary data directory for tests"""
-        data_dir = tmp_path / "data"
-        data_dir.mkdir()
+    def test_data_dir(self, _base_dir, request):
+        """Per-test data directory inside the shared session directory"""
+        data_dir = _base_dir / request.node.name
+        data_dir.mkdir(exist_ok=True)
         return data_dir
 
+    @pytest.fixture(autouse=True)
+    def _frozen_time(self, monkeypatch):
+        """Freeze now_helsinki() used by EmergencyStopManager.create()"""
+        monkeypatch.setattr('src.utils.timezone.now_helsinki', lambda: _FIXED_TIME)
+
     @pytest.fixture
     def mock_logger(self):
-        """Create mock logger"""
-        return Mock(spec=logging.Logger)
+        """Create stub logger"""
+        return _StubLogger()
+
+    @pytest.fixture(autouse=True)
+    def _patch_data_dir(self, monkeypatch, test_data_dir):
+        """Point DATA_DIR at the per-test temporary directory"""
+        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
 
     @pytest.fixture
-    def manager(self, mock_logger, test_data_dir, monkeypatch):
+    def manager(self, mock_logger):
         """Create EmergencyStopManager with temporary directory"""
-        # Patch the DATA_DIR to use temporary directory
-        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
         return EmergencyStopManager(logger=mock_logger)
 
-    def test_initialization(self, mock_logger, test_data_dir, monkeypatch):
+    def test_initialization(self, mock_logger):
         """Test EmergencyStopManager initialization"""
-        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
         manager = EmergencyStopManager(logger=mock_logger)
 
-        assert manager.logger == mock_logger
+        assert manager.logger is mock_logger
+        assert isinstance(manager.logger, _StubLogger)
 
-    def test_initialization_without_logger(self, test_data_dir, monkeypatch):
+    def test_initialization_without_logger(self):
         """Test initialization without custom logger"""
-        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
         manager = EmergencyStopManager()
 
         assert manager.logger is not None
         assert isinstance(manager.logger, logging.Logger)
 
-    def test_get_file_path(self, test_data_dir, monkeypatch):
-        """Test getting emergency stop file path"""
-        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
-
-        # Test various account IDs
-        path1 = EmergencyStopManager.get_file_path(1)
-        assert path1 == test_data_dir / ".001_emergency_stop"
-
-        path2 = EmergencyStopManager.get_file_path(42)
-        assert path2 == test_data_dir / ".042_emergency_stop"
-
-        path3 = EmergencyStopManager.get_file_path(999)
-        assert path3 == test_data_dir / ".999_emergency_stop"
-
-    def test_exists_no_file(self, manager, test_data_dir):
+    @pytest.mark.parametrize("account_id,expected_name", [
+        (1, ".001_emergency_stop"),
+        (42, ".042_emergency_stop"),
+        (99, ".099_emergency_stop"),
+        (999, ".999_emergency_stop"),
+    ])
+    def test_get_file_path(self, test_data_dir, account_id, expected_name):
+        """Test file path is hidden (dot prefix), zero-padded and inside DATA_DIR"""
+        assert EmergencyStopManager.get_file_path(account_id) == test_data_dir / expected_name
+
+    def test_exists_no_file(self, read_only_manager):
         """Test checking existence when file doesn't exist"""
-        assert EmergencyStopManager.exists(1) is False
+        assert read_only_manager.exists(1) is False
 
     def test_exists_file_present(self, manager, test_data_dir):
         """Test checking existence when file exists"""
@@ -71,9 +130,9 @@ class TestEmergencyStopManager:
 
         assert EmergencyStopManager.exists(1) is True
 
-    def test_get_data_no_file(self, manager):
+    def test_get_data_no_file(self, read_only_manager):
         """Test getting data when file doesn't exist"""
-        data = EmergencyStopManager.get_data(1)
+        data = read_only_manager.get_data(1)
 
         assert data is None
 
@@ -81,21 +140,11 @@ class TestEmergencyStopManager:
         """Test getting data from valid file"""
         # Create emergency stop file
         file_path = test_data_dir / ".001_emergency_stop"
-        test_data = {
-            "timestamp": "2025-01-15T10:30:00+02:00",
-            "account_id": 1,
-            "symbol": "DOGEUSDT",
-            "reason": "MM Rate exceeded threshold"
-        }
-        file_path.write_text(json.dumps(test_data))
+        file_path.write_bytes(_VALID_PAYLOAD)
 
         data = EmergencyStopManager.get_data(1)
 
-        assert data is not None
-        assert data["timestamp"] == "2025-01-15T10:30:00+02:00"
-        assert data["account_id"] == 1
-        assert data["symbol"] == "DOGEUSDT"
-        assert data["reason"] == "MM Rate exceeded threshold"
+        assert data == _VALID_DATA
 
     def test_get_data_corrupted_file(self, manager, test_data_dir):
         """Test getting data from corrupted JSON file"""
@@ -107,16 +156,8 @@ class TestEmergencyStopManager:
 
         assert data is None
 
-    @patch('src.utils.timezone.now_helsinki')
-    def test_create_emergency_stop_file(self, mock_now, manager, test_data_dir, mock_logger):
+    def test_create_emergency_stop_file(self, manager, test_data_dir, mock_logger):
         """Test creating emergency stop file"""
-        from datetime import datetime
-        import pytz
-
-        # Mock current time
-        mock_time = datetime(2025, 1, 15, 10, 30, 0, tzinfo=pytz.timezone('Europe/Helsinki'))
-        mock_now.return_value = mock_time
-
         # Create emergency stop
         manager.create(
             account_id=1,
@@ -129,26 +170,18 @@ class TestEmergencyStopManager:
         assert file_path.exists()
 
         # Check file contents
-        with open(file_path) as f:
-            data = json.load(f)
+        data = orjson.loads(file_path.read_bytes())
 
         assert data["account_id"] == 1
         assert data["symbol"] == "DOGEUSDT"
         assert data["reason"] == "Test emergency stop"
-        assert "timestamp" in data
+        assert data["timestamp"] == _FIXED_TIME.isoformat()
 
         # Check logger was called
         mock_logger.critical.assert_called_once()
 
-    @patch('src.utils.timezone.now_helsinki')
-    def test_create_with_additional_data(self, mock_now, manager, test_data_dir):
+    def test_create_with_additional_data(self, manager, test_data_dir):
         """Test creating emergency stop file with additional data"""
-        from datetime import datetime
-        import pytz
-
-        mock_time = datetime(2025, 1, 15, 10, 30, 0, tzinfo=pytz.timezone('Europe/Helsinki'))
-        mock_now.return_value = mock_time
-
         # Create with additional data
         additional = {
             "mm_rate": 95.5,
@@ -164,16 +197,15 @@ class TestEmergencyStopManager:
 
         # Check file contents
         file_path = test_data_dir / ".002_emergency_stop"
-        with open(file_path) as f:
-            data = json.load(f)
+        data = orjson.loads(file_path.read_bytes())
 
         assert data["mm_rate"] == 95.5
         assert data["balance"] == 50.25
 
-    def test_validate_and_raise_no_file(self, manager):
+    def test_validate_and_raise_no_file(self, read_only_manager):
         """Test validation when no emergency stop file exists"""
         # Should not raise any exception
-        EmergencyStopManager.validate_and_raise(
+        read_only_manager.validate_and_raise(
             account_id=1,
             account_name="Test Account"
         )
@@ -182,13 +214,7 @@ class TestEmergencyStopManager:
         """Test validation raises error when file exists"""
         # Create emergency stop file
         file_path = test_data_dir / ".001_emergency_stop"
-        test_data = {
-            "timestamp": "2025-01-15T10:30:00+02:00",
-            "account_id": 1,
-            "symbol": "DOGEUSDT",
-            "reason": "Test reason"
-        }
-        file_path.write_text(json.dumps(test_data))
+        file_path.write_bytes(_VALIDATE_PAYLOAD)
 
         # Should raise RuntimeError
         with pytest.raises(RuntimeError) as exc_info:
@@ -240,44 +266,19 @@ class TestEmergencyStopManager:
     def test_multiple_account_files(self, manager, test_data_dir):
         """Test handling multiple account emergency stop files"""
         # Create files for multiple accounts
-        for account_id in [1, 2, 5, 10]:
-            file_path = test_data_dir / f".{account_id:03d}_emergency_stop"
-            data = {"account_id": account_id, "reason": f"Test {account_id}"}
-            file_path.write_text(json.dumps(data))
-
-        # Check each exists
-        assert EmergencyStopManager.exists(1) is True
-        assert EmergencyStopManager.exists(2) is True
-        assert EmergencyStopManager.exists(5) is True
-        assert EmergencyStopManager.exists(10) is True
-        assert EmergencyStopManager.exists(3) is False
-
-        # Check data retrieval
-        data1 = EmergencyStopManager.get_data(1)
-        assert data1["account_id"] == 1
-
-        data5 = EmergencyStopManager.get_data(5)
-        assert data5["account_id"] == 5
-
-    def test_file_path_format(self, test_data_dir, monkeypatch):
-        """Test that file paths follow correct format"""
-        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
-
-        # Files should be hidden (start with dot) and zero-padded
-        path1 = EmergencyStopManager.get_file_path(1)
-        assert path1.name == ".001_emergency_stop"
+        for account_id, payload in _MULTI_ACCOUNT_PAYLOADS:
+            (test_data_dir / f".{account_id:03d}_emergency_stop").write_bytes(payload)
 
-        path99 = EmergencyStopManager.get_file_path(99)
-        assert path99.name == ".099_emergency_stop"
+        # Check each exists (account 3 has no file)
+        assert [EmergencyStopManager.exists(i) for i in (1, 2, 5, 10, 3)] == [True, True, True, True, False]
 
-        path999 = EmergencyStopManager.get_file_path(999)
-        assert path999.name == ".999_emergency_stop"
+        # Check data retrieval picks the right account's file
+        assert EmergencyStopManager.get_data(5)["account_id"] == 5
 
     def test_directory_creation(self, manager, test_data_dir):
         """Test that data directory is created if it doesn't exist"""
-        # Remove data directory
-        import shutil
-        shutil.rmtree(test_data_dir)
+        # Remove (empty) data directory
+        test_data_dir.rmdir()
         assert not test_data_dir.exists()
 
         # Create emergency stop (should create directory)
@@ -299,29 +300,7 @@ class TestEmergencyStopManager:
             reason="Test reason"
         )
 
-        file_path = test_data_dir / ".001_emergency_stop"
-
-        # Read raw file content
-        content = file_path.read_text()
-
-        # Should be indented (indent=2)
-        assert "  " in content  # Has indentation
-        assert "\n" in content  # Has newlines
-
-        # Should be valid JSON
-        data = json.loads(content)
-        assert data["symbol"] == "DOGEUSDT"
+        content = (test_data_dir / ".001_emergency_stop").read_bytes()
 
-    def test_static_methods_work_without_instance(self, test_data_dir, monkeypatch):
-        """Test that static methods work without creating instance"""
-        monkeypatch.setattr(EmergencyStopManager, 'DATA_DIR', test_data_dir)
-
-        # Should work without creating instance
-        path = EmergencyStopManager.get_file_path(1)
-        assert path is not None
-
-        exists = EmergencyStopManager.exists(1)
-        assert exists is False
-
-        data = EmergencyStopManager.get_data(1)
-        assert data is None
+        # Should be indented (indent=2); parsing is covered by test_get_data_valid_file
+        assert b"\n  " in content
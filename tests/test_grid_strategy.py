@@ -1,9 +1,35 @@
 """Unit tests for GridStrategy"""
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch, call
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock
 from src.strategy.grid_strategy import GridStrategy
 
+# Keep this module on a single pytest-xdist worker (pytest -n auto --dist=loadgroup)
+pytestmark = pytest.mark.xdist_group("grid_strategy_unit")
+
+# Shared WebSocket payload fields (read-only); tests build variants with {**_BASE_..., ...}
+_BASE_POS = MappingProxyType({'symbol': 'SOLUSDT', 'avgPrice': '100.0'})
+_BASE_WALLET = MappingProxyType({'accountType': 'UNIFIED'})
+_BASE_ORDER = MappingProxyType({'orderStatus': 'New', 'orderType': 'Market', 'symbol': 'SOLUSDT'})
+_BASE_TP_ORDER = MappingProxyType({**_BASE_ORDER, 'reduceOnly': True})  # TP orders are reduce-only
+
+
+# get_wallet_balance responses for TestRiskLimits, keyed by scenario
+_WALLET_RESPONSES = {
+    'safe': {'list': [{'accountType': 'UNIFIED', 'accountMMRate': '0.0017'}]},  # 0.17%
+    'funded': {'list': [{
+        'accountType': 'UNIFIED',
+        'accountMMRate': '0.01',  # 1%
+        'totalAvailableBalance': '1000.0'
+    }]},
+}
+
+
+def make_pos(side, size, cum_pnl, **overrides):
+    """Build a Position WebSocket payload on top of _BASE_POS"""
+    return {**_BASE_POS, 'side': side, 'size': size, 'cumRealisedPnl': cum_pnl, **overrides}
+
 
 class TestGridStrategyInitialization:
     """Tests for GridStrategy initialization"""
@@ -24,73 +50,37 @@ class TestGridStrategyInitialization:
 class TestUSDConversions:
     """Tests for USD to quantity conversions"""
 
-    def test_usd_to_qty(self, grid_strategy):
-        """Test USD to quantity conversion with leverage"""
-        qty = grid_strategy._usd_to_qty(100.0, 200.0)
+    @pytest.mark.parametrize("method,amount,price,expected", [
         # With 100x leverage: (100 USD × 100) / 200 per coin = 50.0 coins
-        assert qty == pytest.approx(50.0)
-
-    def test_usd_to_qty_rounding(self, grid_strategy):
-        """Test USD to quantity conversion with rounding and leverage"""
-        qty = grid_strategy._usd_to_qty(22.0, 220.0)
+        ("_usd_to_qty", 100.0, 200.0, 50.0),
         # With 100x leverage: (22 USD × 100) / 220 per coin = 10.0 coins
-        assert qty == pytest.approx(10.0)
-
-    def test_usd_to_qty_minimum(self, grid_strategy):
-        """Test USD to quantity respects minimum"""
-        qty = grid_strategy._usd_to_qty(0.01, 1000.0)
+        ("_usd_to_qty", 22.0, 220.0, 10.0),
         # Very small amount, should return minimum 0.1
-        assert qty == pytest.approx(0.1)
-
-    def test_qty_to_usd(self, grid_strategy):
-        """Test quantity to USD conversion"""
-        usd = grid_strategy._qty_to_usd(0.5, 200.0)
+        ("_usd_to_qty", 0.01, 1000.0, 0.1),
         # 0.5 coins * 200 per coin = 100 USD
-        assert usd == pytest.approx(100.0)
+        ("_qty_to_usd", 0.5, 200.0, 100.0),
+    ], ids=["usd_to_qty", "usd_to_qty_rounding", "usd_to_qty_minimum", "qty_to_usd"])
+    def test_conversion(self, grid_strategy, method, amount, price, expected):
+        """Test USD/quantity conversions (with leverage, rounding and minimum)"""
+        # Results are rounded to qtyStep, so they compare exactly
+        assert getattr(grid_strategy, method)(amount, price) == expected
 
 
 class TestShouldAddPosition:
     """Tests for should_add_position logic"""
 
-    def test_should_add_long_when_price_drops(self, grid_strategy, position_manager):
-        """Test LONG position should be added when price drops"""
-        # Setup: Add initial LONG position at 100
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
-        # Price drops to 99 (1% drop)
-        should_add = grid_strategy._should_add_position('Buy', 99.0)
-        assert should_add is True
-
-    def test_should_not_add_long_when_price_rises(self, grid_strategy, position_manager):
-        """Test LONG position should NOT be added when price rises"""
-        # Setup: Add initial LONG position at 100
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
-        # Price rises to 101
-        should_add = grid_strategy._should_add_position('Buy', 101.0)
-        assert should_add is False
-
-    def test_should_add_short_when_price_rises(self, grid_strategy, position_manager):
-        """Test SHORT position should be added when price rises"""
-        # Setup: Add initial SHORT position at 100
-        position_manager.add_position('Sell', 100.0, 0.1, 0)
+    @pytest.mark.parametrize("side,price,expected", [
+        ('Buy', 99.0, True),     # LONG: price drops 1% → add
+        ('Buy', 101.0, False),   # LONG: price rises → don't add
+        ('Sell', 101.0, True),   # SHORT: price rises 1% → add
+        ('Sell', 99.0, False),   # SHORT: price drops → don't add
+    ], ids=["long_price_drops", "long_price_rises", "short_price_rises", "short_price_drops"])
+    def test_should_add_position(self, grid_strategy, position_manager, side, price, expected):
+        """Test grid entry decision relative to initial position at 100"""
+        position_manager.add_position(side, 100.0, 0.1, 0)
         grid_strategy.pm = position_manager
 
-        # Price rises to 101 (1% rise)
-        should_add = grid_strategy._should_add_position('Sell', 101.0)
-        assert should_add is True
-
-    def test_should_not_add_short_when_price_drops(self, grid_strategy, position_manager):
-        """Test SHORT position should NOT be added when price drops"""
-        # Setup: Add initial SHORT position at 100
-        position_manager.add_position('Sell', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
-        # Price drops to 99
-        should_add = grid_strategy._should_add_position('Sell', 99.0)
-        assert should_add is False
+        assert grid_strategy._should_add_position(side, price) is expected
 
     def test_should_not_add_when_no_last_entry(self, grid_strategy):
         """Test should not add when no last entry exists"""
@@ -102,47 +92,43 @@ class TestShouldAddPosition:
 class TestExecuteGridOrder:
     """Tests for execute_grid_order"""
 
-    def test_execute_grid_order_long(self, grid_strategy, position_manager, mock_bybit_client):
-        """Test executing a grid order for LONG"""
-        # Setup: Add initial position
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
+    @pytest.fixture
+    def mock_update_tp(self, monkeypatch, grid_strategy):
+        """Replace _update_tp_order with a mock"""
+        mock = Mock()
+        monkeypatch.setattr(grid_strategy, '_update_tp_order', mock)
+        return mock
 
+    def test_execute_grid_order_long(self, gs_with_long, mock_bybit_client):
+        """Test executing a grid order for LONG"""
         # Execute grid order at 99
-        grid_strategy._execute_grid_order('Buy', 99.0)
+        gs_with_long._execute_grid_order('Buy', 99.0)
 
         # Should have 2 positions now
-        assert position_manager.get_position_count('Buy') == 2
+        assert gs_with_long.pm.get_position_count('Buy') == 2
 
         # Check that order was placed (in dry_run, no actual API call)
         assert mock_bybit_client.place_order.call_count == 0  # dry_run = True
 
-    def test_execute_grid_order_sizing(self, grid_strategy, position_manager):
+    def test_execute_grid_order_sizing(self, gs_with_long):
         """Test grid order sizing with multiplier (applies to MARGIN, not position)"""
-        # Setup: Add initial position
-        # 0.1 qty @ 100 = $10 position value, $0.1 MARGIN (leverage=100)
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
+        # Initial position: 0.1 qty @ 100 = $10 position value, $0.1 MARGIN (leverage=100)
 
         # Execute grid order at $99
         # Current MARGIN: $10 / 100 = $0.1
         # New MARGIN: $0.1 × (2.0 - 1) = $0.1
         # New position value: $0.1 × 100 = $10
         # New qty: $10 / 99 ≈ 0.101 → rounds to 0.1
-        grid_strategy._execute_grid_order('Buy', 99.0)
+        gs_with_long._execute_grid_order('Buy', 99.0)
 
         # Check total quantity increased
-        total = position_manager.get_total_quantity('Buy')
+        total = gs_with_long.pm.get_total_quantity('Buy')
         assert total > 0.1  # Should be ~0.2 now
 
-    def test_execute_grid_order_calls_update_tp(self, grid_strategy, position_manager):
+    def test_execute_grid_order_calls_update_tp(self, gs_with_long, mock_update_tp):
         """Test that executing grid order updates TP"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
-        with patch.object(grid_strategy, '_update_tp_order') as mock_update_tp:
-            grid_strategy._execute_grid_order('Buy', 99.0)
-            mock_update_tp.assert_called_once_with('Buy')
+        gs_with_long._execute_grid_order('Buy', 99.0)
+        mock_update_tp.assert_called_once_with('Buy')
 
     def test_execute_grid_order_margin_vs_position_value(self, grid_strategy, position_manager):
         """Test that averaging applies classic martingale: each position = previous × multiplier"""
@@ -179,53 +165,39 @@ class TestExecuteGridOrder:
 class TestRiskLimits:
     """Tests for risk management"""
 
-    def test_check_risk_limits_safe(self, grid_strategy, position_manager, mock_bybit_client):
+    def test_check_risk_limits_safe(self, gs_with_long, mock_bybit_client):
         """Test risk limits check when safe (low accountMMRate)"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
         # Mock wallet balance with safe Account Maintenance Margin Rate
-        mock_bybit_client.get_wallet_balance.return_value = {
-            'list': [{
-                'accountType': 'UNIFIED',
-                'accountMMRate': '0.0017'  # 0.17% - safe
-            }]
-        }
+        mock_bybit_client.get_wallet_balance.return_value = _WALLET_RESPONSES['safe']
 
         # Should be safe with low MM rate
-        is_safe = grid_strategy._check_risk_limits(100.0)
+        is_safe = gs_with_long._check_risk_limits(100.0)
         assert is_safe is True
 
-    def test_check_risk_limits_near_liquidation(self, grid_strategy, position_manager, mock_bybit_client):
+    def test_check_risk_limits_near_liquidation(self, gs_with_both, monkeypatch):
         """Test risk limits when Account MM Rate >= 90% (emergency close all positions)"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        position_manager.add_position('Sell', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
+        grid_strategy = gs_with_both
         grid_strategy.dry_run = False  # Must be False to check real accountMMRate
 
-        # Mock BalanceManager to return critical Account MM Rate
-        with patch.object(grid_strategy.balance_manager, 'get_mm_rate', return_value=92.0):
-            with patch.object(grid_strategy, '_emergency_close') as mock_close:
-                # Should raise RuntimeError and close ALL positions
-                with pytest.raises(RuntimeError, match="Maintenance Margin Rate"):
-                    grid_strategy._check_risk_limits(100.0)
+        # Stub BalanceManager to return critical Account MM Rate
+        grid_strategy.balance_manager = SimpleNamespace(get_mm_rate=Mock(return_value=92.0))
+        mock_close = Mock()
+        monkeypatch.setattr(grid_strategy, '_emergency_close', mock_close)
+
+        # Should raise RuntimeError and close ALL positions
+        with pytest.raises(RuntimeError, match="Maintenance Margin Rate"):
+            grid_strategy._check_risk_limits(100.0)
 
-                # Should close both LONG and SHORT
-                assert mock_close.call_count == 2
+        # Should close both LONG and SHORT
+        assert mock_close.call_count == 2
 
     def test_check_risk_limits_max_exposure(self, grid_strategy, position_manager, mock_bybit_client):
         """Test that insufficient balance is checked in _execute_grid_order, not in _check_risk_limits"""
         # This test was updated because max_exposure check was moved from _check_risk_limits
         # to _execute_grid_order where it checks actual available balance from exchange
 
-        # Mock wallet balance with safe accountMMRate
-        mock_bybit_client.get_wallet_balance.return_value = {
-            'list': [{
-                'accountType': 'UNIFIED',
-                'accountMMRate': '0.01',  # 1% - safe
-                'totalAvailableBalance': '1000.0'  # Plenty of balance
-            }]
-        }
+        # Mock wallet balance with safe accountMMRate and plenty of balance
+        mock_bybit_client.get_wallet_balance.return_value = _WALLET_RESPONSES['funded']
 
         # Risk check should pass now (balance check happens in _execute_grid_order)
         is_safe = grid_strategy._check_risk_limits(100.0)
@@ -248,18 +220,31 @@ class TestSyncWithExchange:
         assert position_manager.get_position_count('Buy') == 1
         assert position_manager.get_position_count('Sell') == 1
 
-    def test_sync_restores_positions_from_exchange(self, grid_strategy, mock_bybit_client, position_manager):
-        """Test that restore restores positions from exchange"""
-        # Mock: Buy position exists on exchange, no Sell position
-        def get_position_side_effect(symbol, side, category):
-            if side == 'Buy':
-                return {'size': '0.5', 'avgPrice': '100.0'}
-            return None  # No Sell position
+        # Dry run never polls the exchange for positions
+        assert mock_bybit_client.get_active_position.call_count == 0
 
-        mock_bybit_client.get_active_position.side_effect = get_position_side_effect
+    def test_sync_restores_positions_from_exchange(self, mock_bybit_client, position_manager,
+                                                    sample_config, mock_metrics_tracker):
+        """Test that restore restores positions from exchange"""
+        # Live (non-dry-run) strategy: dry run never polls the exchange for positions
+        strategy = GridStrategy(
+            client=mock_bybit_client,
+            position_manager=position_manager,
+            config=sample_config,
+            dry_run=False,
+            metrics_tracker=mock_metrics_tracker
+        )
+        strategy.balance_manager.update_from_websocket(balance=1000.0, mm_rate=0.1)
+
+        # Mock: Buy position exists on exchange, no Sell position (one response per side, in order)
+        mock_bybit_client.get_active_position.side_effect = [
+            {'size': '0.5', 'avgPrice': '100.0'},   # Buy side
+            None,                                   # Sell side
+        ]
+        mock_bybit_client.get_open_orders.return_value = []
 
         # Mock order history (required for position restoration)
-        mock_bybit_client.get_order_history.return_value = [
+        mock_bybit_client.get_order_history.return_value = {'list': [
             {
                 'orderId': 'order1',
                 'side': 'Buy',
@@ -270,14 +255,15 @@ class TestSyncWithExchange:
                 'createdTime': '1609459200000',
                 'reduceOnly': False  # Opening order
             }
-        ]
-
-        grid_strategy.pm = position_manager
+        ]}
 
-        grid_strategy.restore_state_from_exchange(100.0)
+        strategy.restore_state_from_exchange(100.0)
 
-        # Should restore Buy position from exchange
-        assert position_manager.get_total_quantity('Buy') > 0
+        # Exchange polled once per side
+        assert mock_bybit_client.get_active_position.call_count == 2
+        # Should restore Buy position from exchange (one level from order history)
+        assert position_manager.get_total_quantity('Buy') == pytest.approx(0.5)
+        assert position_manager.get_position_count('Buy') == 1
         # Should also open initial Sell position
         assert position_manager.get_total_quantity('Sell') > 0
 
@@ -285,300 +271,187 @@ class TestSyncWithExchange:
 class TestUpdateTPOrder:
     """Tests for TP order management"""
 
-    def test_update_tp_order_calculates_correct_price_long(self, grid_strategy, position_manager):
-        """Test TP order price calculation for LONG (with fees)"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
-        with patch.object(grid_strategy.client, 'place_tp_order') as mock_place_tp:
-            mock_place_tp.return_value = 'tp_123'
-            grid_strategy.dry_run = False
-
-            grid_strategy._update_tp_order('Buy')
-
-            # Should place TP at 101.075 (1% + 0.075% fees above 100)
-            # Fees: 1 position × 0.055% (taker) + 0.020% (maker) = 0.075%
-            # Honest TP: 1.0% + 0.075% = 1.075%
-            call_args = mock_place_tp.call_args
-            tp_price = call_args[1]['tp_price']
-            assert tp_price == pytest.approx(101.075)
-
-    def test_update_tp_order_calculates_correct_price_short(self, grid_strategy, position_manager):
-        """Test TP order price calculation for SHORT (with fees)"""
-        position_manager.add_position('Sell', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
-
-        with patch.object(grid_strategy.client, 'place_tp_order') as mock_place_tp:
-            mock_place_tp.return_value = 'tp_123'
-            grid_strategy.dry_run = False
+    @pytest.mark.parametrize("side,expected_tp", [
+        ('Buy', 101.075),   # 1% + 0.075% fees above 100
+        ('Sell', 98.925),   # 1% + 0.075% fees below 100
+    ], ids=["long", "short"])
+    def test_update_tp_order_calculates_correct_price(self, grid_strategy, position_manager,
+                                                      mock_bybit_client, side, expected_tp):
+        """Test TP order price calculation (with fees)"""
+        position_manager.add_position(side, 100.0, 0.1, 0)
+        mock_bybit_client.place_tp_order.return_value = 'tp_123'
+        grid_strategy.dry_run = False
 
-            grid_strategy._update_tp_order('Sell')
+        grid_strategy._update_tp_order(side)
 
-            # Should place TP at 98.925 (1% + 0.075% fees below 100)
-            # Fees: 1 position × 0.055% (taker) + 0.020% (maker) = 0.075%
-            # Honest TP: 1.0% + 0.075% = 1.075%
-            call_args = mock_place_tp.call_args
-            tp_price = call_args[1]['tp_price']
-            assert tp_price == pytest.approx(98.925)
+        # Fees: 1 position × 0.055% (taker) + 0.020% (maker) = 0.075%
+        # Honest TP: 1.0% + 0.075% = 1.075%
+        tp_price = mock_bybit_client.place_tp_order.call_args[1]['tp_price']
+        assert tp_price == pytest.approx(expected_tp)
 
-    def test_update_tp_order_cancels_old_order(self, grid_strategy, position_manager):
+    def test_update_tp_order_cancels_old_order(self, gs_with_long, mock_bybit_client):
         """Test that update TP cancels old order first"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        position_manager.set_tp_order_id('Buy', 'old_tp_123')
-        grid_strategy.pm = position_manager
-        grid_strategy.dry_run = False
-
-        with patch.object(grid_strategy.client, 'cancel_order') as mock_cancel:
-            with patch.object(grid_strategy.client, 'place_tp_order') as mock_place:
-                mock_place.return_value = 'new_tp_456'
+        gs_with_long.pm.set_tp_order_id('Buy', 'old_tp_123')
+        gs_with_long.dry_run = False
+        mock_bybit_client.place_tp_order.return_value = 'new_tp_456'
 
-                grid_strategy._update_tp_order('Buy')
+        gs_with_long._update_tp_order('Buy')
 
-                # Should cancel old order
-                mock_cancel.assert_called_once_with('SOLUSDT', 'old_tp_123', 'linear')
+        # Should cancel old order
+        mock_bybit_client.cancel_order.assert_called_once_with('SOLUSDT', 'old_tp_123', 'linear')
 
 
 class TestOnPriceUpdate:
     """Tests for on_price_update orchestration"""
 
-    def test_on_price_update_checks_all_conditions(self, grid_strategy, position_manager):
+    @pytest.fixture
+    def checks(self, monkeypatch, gs_with_long):
+        """Mock risk and grid checks on a strategy with one LONG position"""
+        mock_risk = Mock(return_value=True)
+        mock_grid = Mock()
+        monkeypatch.setattr(gs_with_long, '_check_risk_limits', mock_risk)
+        monkeypatch.setattr(gs_with_long, '_check_grid_entries', mock_grid)
+        return mock_risk, mock_grid
+
+    def test_on_price_update_checks_all_conditions(self, grid_strategy, checks):
         """Test that on_price_update checks risk limits and grid entries"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
+        mock_risk, mock_grid = checks
 
-        with patch.object(grid_strategy, '_check_risk_limits', return_value=True) as mock_risk:
-            with patch.object(grid_strategy, '_check_grid_entries') as mock_grid:
-                grid_strategy.on_price_update(100.0)
+        grid_strategy.on_price_update(100.0)
 
-                # Checks should be called (TP now handled by WebSocket)
-                mock_risk.assert_called_once_with(100.0)
-                mock_grid.assert_called_once_with(100.0)
+        # Checks should be called (TP now handled by WebSocket)
+        mock_risk.assert_called_once_with(100.0)
+        mock_grid.assert_called_once_with(100.0)
 
-    def test_on_price_update_stops_on_risk_failure(self, grid_strategy, position_manager):
+    def test_on_price_update_stops_on_risk_failure(self, grid_strategy, checks):
         """Test that on_price_update stops if risk check fails"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        grid_strategy.pm = position_manager
+        mock_risk, mock_grid = checks
+        mock_risk.return_value = False
 
-        with patch.object(grid_strategy, '_check_risk_limits', return_value=False) as mock_risk:
-            with patch.object(grid_strategy, '_check_grid_entries') as mock_grid:
-                grid_strategy.on_price_update(100.0)
+        grid_strategy.on_price_update(100.0)
 
-                # Risk check called
-                mock_risk.assert_called_once()
-                # But grid should not be called
-                mock_grid.assert_not_called()
+        # Risk check called
+        mock_risk.assert_called_once()
+        # But grid should not be called
+        mock_grid.assert_not_called()
 
 
 class TestOnPositionUpdate:
     """Tests for on_position_update (Position WebSocket callback)"""
 
-    def test_position_opening_tracked(self, grid_strategy, position_manager):
-        """Test that position opening updates cumRealisedPnl tracking"""
-        grid_strategy.pm = position_manager
+    @pytest.fixture(autouse=True)
+    def _patch_open(self, monkeypatch, grid_strategy):
+        """Keep closures from reopening initial positions"""
+        mock = Mock()
+        monkeypatch.setattr(grid_strategy, '_open_initial_position', mock)
+        return mock
 
-        # Position update: new position opened
-        position_data = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '0.5',  # Position opened
-            'cumRealisedPnl': '0',  # No PnL yet
-            'avgPrice': '100.0'
-        }
+    @pytest.fixture
+    def gs_live(self, grid_strategy):
+        """GridStrategy in live mode (closures are logged and reopened)"""
+        grid_strategy.dry_run = False
+        return grid_strategy
 
-        grid_strategy.on_position_update(position_data)
+    def test_position_opening_tracked(self, grid_strategy):
+        """Test that position opening updates cumRealisedPnl tracking"""
+        # Position update: new position opened, no PnL yet
+        grid_strategy.on_position_update(make_pos('Buy', '0.5', '0'))
 
         # Should track cumRealisedPnl
         assert grid_strategy._last_cum_realised_pnl['Buy'] == 0.0
 
-    def test_position_closing_detected(self, grid_strategy, position_manager):
+    def test_position_closing_detected(self, gs_live, position_manager):
         """Test that position closure is detected when size=0"""
         # Setup: Add positions
         position_manager.add_position('Buy', 100.0, 0.5, 0)
-        grid_strategy.pm = position_manager
-
-        # Track initial cumRealisedPnl
-        grid_strategy._last_cum_realised_pnl['Buy'] = 10.0
-
-        # Position update: position closed
-        position_data = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '0',  # Closed
-            'cumRealisedPnl': '15.5',  # Made profit
-            'avgPrice': '101.0'
-        }
-
-        with patch.object(grid_strategy, '_open_initial_position') as mock_open:
-            grid_strategy.dry_run = False
-            grid_strategy.on_position_update(position_data)
-
-            # Should clear positions
-            assert position_manager.get_position_count('Buy') == 0
-
-            # Should update cumRealisedPnl tracking
-            assert grid_strategy._last_cum_realised_pnl['Buy'] == 15.5
-
-            # Should log to metrics (check via metrics_tracker mock)
-            assert grid_strategy.metrics_tracker.log_trade.called
-
-    def test_cumrealised_pnl_delta_calculation(self, grid_strategy, position_manager):
-        """Test that realized PnL is calculated as delta of cumRealisedPnl"""
-        # Setup: Add positions
-        position_manager.add_position('Sell', 100.0, 0.5, 0)
-        grid_strategy.pm = position_manager
 
         # Track initial cumRealisedPnl
-        grid_strategy._last_cum_realised_pnl['Sell'] = 20.0
+        gs_live._last_cum_realised_pnl['Buy'] = 10.0
 
-        # Position update: position closed with increased cumRealisedPnl
-        position_data = {
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'size': '0',  # Closed
-            'cumRealisedPnl': '28.75',  # Increased by 8.75
-            'avgPrice': '98.0'
-        }
+        # Position update: position closed with profit
+        gs_live.on_position_update(make_pos('Buy', '0', '15.5', avgPrice='101.0'))
 
-        grid_strategy.dry_run = False
+        # Should clear positions
+        assert position_manager.get_position_count('Buy') == 0
 
-        with patch.object(grid_strategy, '_open_initial_position'):
-            grid_strategy.on_position_update(position_data)
+        # Should update cumRealisedPnl tracking
+        assert gs_live._last_cum_realised_pnl['Buy'] == 15.5
 
-            # Check metrics_tracker was called with correct delta PnL
-            call_args = grid_strategy.metrics_tracker.log_trade.call_args
-            assert call_args[1]['pnl'] == pytest.approx(8.75)  # Delta: 28.75 - 20.0
+        # Should log to metrics (check via metrics_tracker mock)
+        assert gs_live.metrics_tracker.log_trade.called
 
     def test_multiple_position_updates(self, grid_strategy, position_manager):
         """Test handling multiple position updates in sequence"""
-        grid_strategy.pm = position_manager
-
         # First update: position opened
-        position_data_1 = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '0.5',
-            'cumRealisedPnl': '0',
-            'avgPrice': '100.0'
-        }
-        grid_strategy.on_position_update(position_data_1)
+        grid_strategy.on_position_update(make_pos('Buy', '0.5', '0'))
         assert grid_strategy._last_cum_realised_pnl['Buy'] == 0.0
 
         # Second update: position increased
-        position_data_2 = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '1.0',
-            'cumRealisedPnl': '0',
-            'avgPrice': '99.5'
-        }
-        grid_strategy.on_position_update(position_data_2)
+        grid_strategy.on_position_update(make_pos('Buy', '1.0', '0', avgPrice='99.5'))
         assert grid_strategy._last_cum_realised_pnl['Buy'] == 0.0
 
         # Third update: position closed with profit
         position_manager.add_position('Buy', 99.5, 1.0, 0)  # Add position for closure test
-        position_data_3 = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '0',
-            'cumRealisedPnl': '12.5',
-            'avgPrice': '101.0'
-        }
         grid_strategy.dry_run = False
 
-        with patch.object(grid_strategy, '_open_initial_position'):
-            grid_strategy.on_position_update(position_data_3)
-            assert grid_strategy._last_cum_realised_pnl['Buy'] == 12.5
-
-    def test_position_closure_calls_metrics(self, grid_strategy, position_manager):
-        """Test that position closure logs to metrics tracker"""
-        position_manager.add_position('Buy', 100.0, 0.5, 0)
-        grid_strategy.pm = position_manager
-        grid_strategy._last_cum_realised_pnl['Buy'] = 5.0
-
-        position_data = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '0',
-            'cumRealisedPnl': '10.25',
-            'avgPrice': '101.0'
-        }
+        grid_strategy.on_position_update(make_pos('Buy', '0', '12.5', avgPrice='101.0'))
+        assert grid_strategy._last_cum_realised_pnl['Buy'] == 12.5
 
-        grid_strategy.dry_run = False
+    @pytest.mark.parametrize("side,last_cum_pnl,cum_pnl,avg_price,expected_pnl,expected_reason", [
+        ('Buy', 5.0, '10.25', '101.0', 5.25, 'Take Profit'),
+        ('Sell', 20.0, '28.75', '98.0', 8.75, 'Take Profit'),
+        ('Sell', 10.0, '7.5', '102.0', -2.5, 'Loss/Liquidation'),
+    ], ids=["long_profit", "short_profit", "short_loss"])
+    def test_position_closure_logs_pnl_delta(self, gs_live, side, last_cum_pnl, cum_pnl, avg_price,
+                                             expected_pnl, expected_reason):
+        """Test that closure logs realized PnL as delta of cumRealisedPnl to metrics tracker"""
+        gs_live.pm.add_position(side, 100.0, 0.5, 0)
+        gs_live._last_cum_realised_pnl[side] = last_cum_pnl
 
-        with patch.object(grid_strategy, '_open_initial_position'):
-            grid_strategy.on_position_update(position_data)
+        gs_live.on_position_update(make_pos(side, '0', cum_pnl, avgPrice=avg_price))
 
-            # Check metrics_tracker.log_trade was called
-            grid_strategy.metrics_tracker.log_trade.assert_called_once()
-            call_kwargs = grid_strategy.metrics_tracker.log_trade.call_args[1]
+        # Check metrics_tracker.log_trade was called once with the delta
+        gs_live.metrics_tracker.log_trade.assert_called_once()
+        call_kwargs = gs_live.metrics_tracker.log_trade.call_args[1]
 
-            # Verify key fields
-            assert call_kwargs['symbol'] == 'SOLUSDT'
-            assert call_kwargs['action'] == 'CLOSE'
-            assert call_kwargs['pnl'] == pytest.approx(5.25)  # 10.25 - 5.0
+        assert call_kwargs['symbol'] == 'SOLUSDT'
+        assert call_kwargs['action'] == 'CLOSE'
+        assert call_kwargs['pnl'] == pytest.approx(expected_pnl)
+        assert call_kwargs['reason'] == expected_reason
 
-    def test_position_closure_with_loss(self, grid_strategy, position_manager):
-        """Test that position closure with loss is logged correctly"""
-        position_manager.add_position('Sell', 100.0, 0.5, 0)
-        grid_strategy.pm = position_manager
-        grid_strategy._last_cum_realised_pnl['Sell'] = 10.0
-
-        position_data = {
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'size': '0',
-            'cumRealisedPnl': '7.5',  # Loss: -2.5
-            'avgPrice': '102.0'
-        }
-
-        grid_strategy.dry_run = False
-
-        with patch.object(grid_strategy, '_open_initial_position'):
-            grid_strategy.on_position_update(position_data)
-
-            # Check metrics logged with negative PnL
-            call_kwargs = grid_strategy.metrics_tracker.log_trade.call_args[1]
-            assert call_kwargs['pnl'] == pytest.approx(-2.5)
-            assert call_kwargs['reason'] == 'Loss/Liquidation'
-
-    def test_dry_run_mode_skips_reopen(self, grid_strategy, position_manager):
+    def test_dry_run_mode_skips_reopen(self, grid_strategy, position_manager, _patch_open):
         """Test that dry_run mode doesn't reopen positions"""
         position_manager.add_position('Buy', 100.0, 0.5, 0)
-        grid_strategy.pm = position_manager
         grid_strategy.dry_run = True  # DRY RUN
 
-        position_data = {
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'size': '0',
-            'cumRealisedPnl': '10.0',
-            'avgPrice': '101.0'
-        }
+        grid_strategy.on_position_update(make_pos('Buy', '0', '10.0', avgPrice='101.0'))
+
+        # Should NOT call _open_initial_position in dry_run mode
+        _patch_open.assert_not_called()
 
-        with patch.object(grid_strategy, '_open_initial_position') as mock_open:
-            grid_strategy.on_position_update(position_data)
 
-            # Should NOT call _open_initial_position in dry_run mode
-            mock_open.assert_not_called()
+@pytest.fixture(scope="module")
+def _balance_manager_template():
+    """BalanceManager mock exposing only update_from_websocket and get_mm_rate"""
+    return Mock(spec=["update_from_websocket", "get_mm_rate"])
 
 
 class TestOnWalletUpdate:
     """Tests for on_wallet_update (Wallet WebSocket callback)"""
 
-    def test_balance_update_from_websocket(self, grid_strategy):
-        """Test that balance update is pushed to BalanceManager"""
-        # Setup balance manager mock
-        balance_manager = MagicMock()
-        grid_strategy.balance_manager = balance_manager
-
-        # Wallet update: balance changed
-        wallet_data = {
-            'accountType': 'UNIFIED',
-            'totalAvailableBalance': '1234.56',
-            'accountMMRate': '0.0015'  # 0.15% as decimal
-        }
+    @pytest.fixture
+    def balance_manager(self, _balance_manager_template, grid_strategy):
+        """Reset shared BalanceManager mock and attach it to the strategy"""
+        _balance_manager_template.reset_mock()
+        grid_strategy.balance_manager = _balance_manager_template
+        return _balance_manager_template
 
-        grid_strategy.on_wallet_update(wallet_data)
+    def test_balance_update_from_websocket(self, grid_strategy, balance_manager):
+        """Test that balance update is pushed to BalanceManager"""
+        # Wallet update: balance changed, MM Rate 0.15% as decimal
+        grid_strategy.on_wallet_update(
+            {**_BASE_WALLET, 'totalAvailableBalance': '1234.56', 'accountMMRate': '0.0015'}
+        )
 
         # Should call balance_manager.update_from_websocket with converted values
         balance_manager.update_from_websocket.assert_called_once()
@@ -589,57 +462,34 @@ class TestOnWalletUpdate:
         assert call_kwargs['initial_margin'] is None             # Not in test data
         assert call_kwargs['maintenance_margin'] is None         # Not in test data
 
-    def test_mm_rate_update(self, grid_strategy):
+    def test_mm_rate_update(self, grid_strategy, balance_manager):
         """Test that MM Rate is correctly converted from decimal to percentage"""
-        balance_manager = MagicMock()
-        grid_strategy.balance_manager = balance_manager
-
-        # Wallet update with MM Rate
-        wallet_data = {
-            'accountType': 'UNIFIED',
-            'totalAvailableBalance': '500.00',
-            'accountMMRate': '0.8950'  # 89.50% as decimal
-        }
-
-        grid_strategy.on_wallet_update(wallet_data)
+        # Wallet update with MM Rate 89.50% as decimal
+        grid_strategy.on_wallet_update(
+            {**_BASE_WALLET, 'totalAvailableBalance': '500.00', 'accountMMRate': '0.8950'}
+        )
 
         # Check MM Rate conversion (decimal * 100 = percentage)
         call_kwargs = balance_manager.update_from_websocket.call_args[1]
         assert call_kwargs['balance'] == pytest.approx(500.00)
         assert call_kwargs['mm_rate'] == pytest.approx(89.50)
 
-    def test_missing_mm_rate(self, grid_strategy):
+    def test_missing_mm_rate(self, grid_strategy, balance_manager):
         """Test handling of missing MM Rate in wallet data"""
-        balance_manager = MagicMock()
-        grid_strategy.balance_manager = balance_manager
-
-        # Wallet update without MM Rate
-        wallet_data = {
-            'accountType': 'UNIFIED',
-            'totalAvailableBalance': '500.00',
-            'accountMMRate': ''  # Empty string
-        }
-
-        grid_strategy.on_wallet_update(wallet_data)
+        # Wallet update without MM Rate (empty string)
+        grid_strategy.on_wallet_update(
+            {**_BASE_WALLET, 'totalAvailableBalance': '500.00', 'accountMMRate': ''}
+        )
 
         # Should call with None for MM Rate
         call_kwargs = balance_manager.update_from_websocket.call_args[1]
         assert call_kwargs['balance'] == pytest.approx(500.00)
         assert call_kwargs['mm_rate'] is None
 
-    def test_invalid_wallet_data_handling(self, grid_strategy):
+    def test_invalid_wallet_data_handling(self, grid_strategy, balance_manager):
         """Test that invalid wallet data doesn't crash"""
-        balance_manager = MagicMock()
-        grid_strategy.balance_manager = balance_manager
-
-        # Invalid wallet data: missing totalAvailableBalance
-        wallet_data = {
-            'accountType': 'UNIFIED',
-            'accountMMRate': '0.0015'
-        }
-
-        # Should not raise exception
-        grid_strategy.on_wallet_update(wallet_data)
+        # Invalid wallet data: missing totalAvailableBalance (should not raise)
+        grid_strategy.on_wallet_update({**_BASE_WALLET, 'accountMMRate': '0.0015'})
 
         # Should not call update if balance is missing
         balance_manager.update_from_websocket.assert_not_called()
@@ -648,14 +498,10 @@ class TestOnWalletUpdate:
         """Test that missing balance_manager doesn't crash"""
         grid_strategy.balance_manager = None
 
-        wallet_data = {
-            'accountType': 'UNIFIED',
-            'totalAvailableBalance': '1000.00',
-            'accountMMRate': '0.0015'
-        }
-
         # Should not raise exception
-        grid_strategy.on_wallet_update(wallet_data)
+        grid_strategy.on_wallet_update(
+            {**_BASE_WALLET, 'totalAvailableBalance': '1000.00', 'accountMMRate': '0.0015'}
+        )
 
 
 class TestOnOrderUpdate:
@@ -663,18 +509,10 @@ class TestOnOrderUpdate:
 
     def test_tp_order_new_tracking(self, grid_strategy):
         """Test that new TP order is tracked in _tp_orders"""
-        # Order update: new TP order created
-        order_data = {
-            'orderId': 'tp_order_123',
-            'orderStatus': 'New',
-            'orderType': 'Market',
-            'positionIdx': '1',  # LONG position
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'reduceOnly': True  # TP orders are reduce-only
-        }
-
-        grid_strategy.on_order_update(order_data)
+        # Order update: new TP order created for LONG position
+        grid_strategy.on_order_update(
+            {**_BASE_TP_ORDER, 'orderId': 'tp_order_123', 'positionIdx': '1', 'side': 'Sell'}
+        )
 
         # Should track order ID for Buy side (positionIdx 1 = LONG)
         assert grid_strategy._tp_orders['Buy'] == 'tp_order_123'
@@ -684,18 +522,11 @@ class TestOnOrderUpdate:
         # Setup: track an order
         grid_strategy._tp_orders['Sell'] = 'tp_order_456'
 
-        # Order update: TP order filled
-        order_data = {
-            'orderId': 'tp_order_456',
-            'orderStatus': 'Filled',
-            'orderType': 'Market',
-            'positionIdx': '2',  # SHORT position
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'reduceOnly': True  # TP orders are reduce-only
-        }
-
-        grid_strategy.on_order_update(order_data)
+        # Order update: TP order filled for SHORT position
+        grid_strategy.on_order_update({
+            **_BASE_TP_ORDER, 'orderId': 'tp_order_456', 'orderStatus': 'Filled',
+            'positionIdx': '2', 'side': 'Buy'
+        })
 
         # Should remove from tracking
         assert 'Sell' not in grid_strategy._tp_orders or grid_strategy._tp_orders['Sell'] is None
@@ -705,18 +536,11 @@ class TestOnOrderUpdate:
         # Setup: track an order
         grid_strategy._tp_orders['Buy'] = 'tp_order_789'
 
-        # Order update: TP order cancelled
-        order_data = {
-            'orderId': 'tp_order_789',
-            'orderStatus': 'Cancelled',
-            'orderType': 'Market',
-            'positionIdx': '1',  # LONG position
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'reduceOnly': True  # TP orders are reduce-only
-        }
-
-        grid_strategy.on_order_update(order_data)
+        # Order update: TP order cancelled for LONG position
+        grid_strategy.on_order_update({
+            **_BASE_TP_ORDER, 'orderId': 'tp_order_789', 'orderStatus': 'Cancelled',
+            'positionIdx': '1', 'side': 'Sell'
+        })
 
         # Should remove from tracking
         assert 'Buy' not in grid_strategy._tp_orders or grid_strategy._tp_orders['Buy'] is None
@@ -724,86 +548,45 @@ class TestOnOrderUpdate:
     def test_multiple_order_updates_sequence(self, grid_strategy):
         """Test handling multiple order updates in sequence"""
         # First: new order for Buy side
-        order_data_1 = {
-            'orderId': 'order_1',
-            'orderStatus': 'New',
-            'orderType': 'Market',
-            'positionIdx': '1',
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'reduceOnly': True
-        }
-        grid_strategy.on_order_update(order_data_1)
+        grid_strategy.on_order_update(
+            {**_BASE_TP_ORDER, 'orderId': 'order_1', 'positionIdx': '1', 'side': 'Sell'}
+        )
         assert grid_strategy._tp_orders['Buy'] == 'order_1'
 
         # Second: new order for Sell side
-        order_data_2 = {
-            'orderId': 'order_2',
-            'orderStatus': 'New',
-            'orderType': 'Market',
-            'positionIdx': '2',
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'reduceOnly': True
-        }
-        grid_strategy.on_order_update(order_data_2)
+        grid_strategy.on_order_update(
+            {**_BASE_TP_ORDER, 'orderId': 'order_2', 'positionIdx': '2', 'side': 'Buy'}
+        )
         assert grid_strategy._tp_orders['Sell'] == 'order_2'
 
         # Third: filled order for Buy side
-        order_data_3 = {
-            'orderId': 'order_1',
-            'orderStatus': 'Filled',
-            'orderType': 'Market',
-            'positionIdx': '1',
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'reduceOnly': True
-        }
-        grid_strategy.on_order_update(order_data_3)
+        grid_strategy.on_order_update({
+            **_BASE_TP_ORDER, 'orderId': 'order_1', 'orderStatus': 'Filled',
+            'positionIdx': '1', 'side': 'Sell'
+        })
         assert 'Buy' not in grid_strategy._tp_orders or grid_strategy._tp_orders['Buy'] is None
         assert grid_strategy._tp_orders['Sell'] == 'order_2'  # Sell order still tracked
 
     def test_position_idx_to_side_mapping(self, grid_strategy):
         """Test correct mapping of positionIdx to side tracking"""
         # positionIdx 1 = LONG = Buy side
-        order_data_long = {
-            'orderId': 'long_order',
-            'orderStatus': 'New',
-            'orderType': 'Market',
-            'positionIdx': '1',
-            'symbol': 'SOLUSDT',
-            'side': 'Sell',
-            'reduceOnly': True
-        }
-        grid_strategy.on_order_update(order_data_long)
+        grid_strategy.on_order_update(
+            {**_BASE_TP_ORDER, 'orderId': 'long_order', 'positionIdx': '1', 'side': 'Sell'}
+        )
         assert grid_strategy._tp_orders['Buy'] == 'long_order'
 
         # positionIdx 2 = SHORT = Sell side
-        order_data_short = {
-            'orderId': 'short_order',
-            'orderStatus': 'New',
-            'orderType': 'Market',
-            'positionIdx': '2',
-            'symbol': 'SOLUSDT',
-            'side': 'Buy',
-            'reduceOnly': True
-        }
-        grid_strategy.on_order_update(order_data_short)
+        grid_strategy.on_order_update(
+            {**_BASE_TP_ORDER, 'orderId': 'short_order', 'positionIdx': '2', 'side': 'Buy'}
+        )
         assert grid_strategy._tp_orders['Sell'] == 'short_order'
 
     def test_invalid_position_idx_ignored(self, grid_strategy):
         """Test that orders with invalid positionIdx are ignored"""
-        # Order with positionIdx 0 (invalid for hedge mode)
-        order_data = {
-            'orderId': 'invalid_order',
-            'orderStatus': 'New',
-            'orderType': 'Market',
-            'positionIdx': '0',
-            'symbol': 'SOLUSDT',
-            'side': 'Sell'
-        }
-
-        grid_strategy.on_order_update(order_data)
+        # Order with positionIdx 0 (invalid for hedge mode), not reduce-only
+        grid_strategy.on_order_update(
+            {**_BASE_ORDER, 'orderId': 'invalid_order', 'positionIdx': '0', 'side': 'Sell'}
+        )
 
         # Should not track anything
         assert grid_strategy._tp_orders.get('Buy') is None
@@ -812,18 +595,9 @@ class TestOnOrderUpdate:
     def test_non_market_orders_ignored(self, grid_strategy):
         """Test that non-Market orders are ignored"""
         # Limit order (not TP order)
-        order_data = {
-            'orderId': 'limit_order',
-            'orderStatus': 'New',
-            'orderType': 'Limit',
-            'positionIdx': '1',
-            'symbol': 'SOLUSDT',
-            'side': 'Sell'
-        }
-
-        grid_strategy.on_order_update(order_data)
+        grid_strategy.on_order_update(
+            {**_BASE_ORDER, 'orderId': 'limit_order', 'orderType': 'Limit', 'positionIdx': '1', 'side': 'Sell'}
+        )
 
         # Should not track Limit orders
         assert grid_strategy._tp_orders.get('Buy') is None
-
-
@@ -1,94 +1,114 @@
 """Integration tests for component interactions"""
 
+import operator
+from collections import ChainMap
 import pytest
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
 from src.strategy.grid_strategy import GridStrategy
 from src.strategy.position_manager import PositionManager
 
 
+# Instrument info returned by the stub client (same lot filter as mock_bybit_client)
+_INSTRUMENTS_INFO = {
+    'retCode': 0,
+    'result': {
+        'list': [{
+            'symbol': 'SOLUSDT',
+            'lotSizeFilter': {
+                'minOrderQty': '0.1',
+                'maxOrderQty': '10000',
+                'qtyStep': '0.1'
+            }
+        }]
+    }
+}
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+# Plain-attribute stand-ins for tests that never inspect calls: many price
+# updates through a Mock spend most of their time in Mock bookkeeping
+_STUB_CLIENT = SimpleNamespace(
+    session=SimpleNamespace(get_instruments_info=lambda **kwargs: _INSTRUMENTS_INFO),
+    place_order=lambda **kwargs: {'retCode': 0, 'result': {'orderId': 'stub_order'}},
+    place_tp_order=lambda *args, **kwargs: 'stub_tp_order',
+    cancel_order=lambda *args, **kwargs: True,
+    close_position=lambda *args, **kwargs: True,
+    get_active_position=_noop,
+    get_open_orders=lambda *args, **kwargs: [],
+    get_order_history=lambda *args, **kwargs: []
+)
+_STUB_METRICS = SimpleNamespace(log_trade=_noop, log_snapshot=_noop)
+
+
+def _build_strategy(client, metrics_tracker, config):
+    """Dry-run GridStrategy with its own PositionManager at the config leverage"""
+    pm = PositionManager(leverage=config['leverage'], enable_state_persistence=False)
+    return GridStrategy(
+        client=client,
+        position_manager=pm,
+        config=config,
+        dry_run=True,
+        metrics_tracker=metrics_tracker
+    )
+
+
+@pytest.fixture
+def make_strategy(mock_bybit_client, sample_config, mock_metrics_tracker):
+    """Factory building a dry-run GridStrategy with its own PositionManager
+
+    Keyword overrides are layered over sample_config with a ChainMap, so the
+    shared base is never copied; leverage is used by both the strategy config
+    and the PositionManager.
+    """
+    def _make(**overrides):
+        return _build_strategy(mock_bybit_client, mock_metrics_tracker, ChainMap(overrides, sample_config))
+    return _make
+
+
+@pytest.fixture
+def make_stub_strategy(sample_config):
+    """Like make_strategy, but wired to the plain stub client and metrics tracker"""
+    def _make(**overrides):
+        return _build_strategy(_STUB_CLIENT, _STUB_METRICS, ChainMap(overrides, sample_config))
+    return _make
+
+
 class TestGridStrategyIntegration:
     """Integration tests for GridStrategy with PositionManager"""
 
-    def test_full_long_cycle(self, mock_bybit_client, sample_config, mock_metrics_tracker):
-        """Test full LONG position lifecycle: open -> average -> take profit"""
-        pm = PositionManager(leverage=10, enable_state_persistence=False)
-
+    @pytest.mark.parametrize("side,against,favorable,avg_moved", [
+        ('Buy', 99.0, 101.0, operator.lt),   # Average lowered due to averaging
+        ('Sell', 101.0, 99.0, operator.gt),  # Average raised due to averaging
+    ], ids=["long", "short"])
+    def test_full_cycle(self, make_strategy, side, against, favorable, avg_moved):
+        """Test full position lifecycle: open -> average -> take profit"""
         # Use lower leverage to avoid risk limits
-        config = sample_config.copy()
-        config['leverage'] = 10
-
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy(leverage=10)
 
         # Step 1: Initial position at 100
-        strategy.pm.add_position('Buy', 100.0, 0.1, 0)
-        assert strategy.pm.get_position_count('Buy') == 1
+        strategy.pm.add_position(side, 100.0, 0.1, 0)
+        assert strategy.pm.get_position_count(side) == 1
 
-        # Step 2: Price drops to 99 -> should trigger averaging
-        strategy.on_price_update(99.0)
-        assert strategy.pm.get_position_count('Buy') == 2  # Added second position
+        # Step 2: Price moves 1% against the position -> should trigger averaging
+        strategy.on_price_update(against)
+        assert strategy.pm.get_position_count(side) == 2  # Added second position
 
-        # Step 3: Price rises to 101 -> should trigger take profit
-        avg_entry = strategy.pm.get_average_entry_price('Buy')
-        assert avg_entry < 100.0  # Average lowered due to averaging
+        # Step 3: Price moves 1% past entry the other way -> should trigger take profit
+        avg_entry = strategy.pm.get_average_entry_price(side)
+        assert avg_moved(avg_entry, 100.0)
 
         # Trigger TP (will close and reopen)
-        strategy.on_price_update(101.0)
+        strategy.on_price_update(favorable)
         # Should have reopened with 1 position
-        assert strategy.pm.get_position_count('Buy') >= 1
-
-    def test_full_short_cycle(self, mock_bybit_client, sample_config, mock_metrics_tracker):
-        """Test full SHORT position lifecycle: open -> average -> take profit"""
-        pm = PositionManager(leverage=10, enable_state_persistence=False)
+        assert strategy.pm.get_position_count(side) >= 1
 
-        # Use lower leverage to avoid risk limits
-        config = sample_config.copy()
-        config['leverage'] = 10
-
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
-
-        # Step 1: Initial position at 100
-        strategy.pm.add_position('Sell', 100.0, 0.1, 0)
-        assert strategy.pm.get_position_count('Sell') == 1
-
-        # Step 2: Price rises to 101 -> should trigger averaging
-        strategy.on_price_update(101.0)
-        assert strategy.pm.get_position_count('Sell') == 2  # Added second position
-
-        # Step 3: Price drops to 99 -> should trigger take profit
-        avg_entry = strategy.pm.get_average_entry_price('Sell')
-        assert avg_entry > 100.0  # Average raised due to averaging
-
-        strategy.on_price_update(99.0)
-        # Should have reopened with 1 position
-        assert strategy.pm.get_position_count('Sell') >= 1
-
-    def test_simultaneous_long_short(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_simultaneous_long_short(self, make_strategy):
         """Test LONG and SHORT positions operating simultaneously"""
-        pm = PositionManager(leverage=10, enable_state_persistence=False)
-
         # Use lower leverage to avoid risk limits
-        config = sample_config.copy()
-        config['leverage'] = 10
-
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy(leverage=10)
 
         # Open both positions at 100
         strategy.pm.add_position('Buy', 100.0, 0.1, 0)
@@ -109,19 +129,10 @@ class TestGridStrategyIntegration:
 
         assert strategy.pm.get_position_count('Buy') >= 1
 
-    def test_max_grid_levels_limit(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_max_grid_levels_limit(self, make_stub_strategy):
         """Test that max grid levels is enforced"""
-        pm = PositionManager(leverage=100)
-        config = sample_config.copy()
-        config['max_grid_levels_per_side'] = 3  # Low limit for testing
-
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_stub_strategy(max_grid_levels_per_side=3)  # Low limit for testing
+        pm = strategy.pm
 
         # Add initial position
         pm.add_position('Buy', 100.0, 0.1, 0)
@@ -134,16 +145,10 @@ class TestGridStrategyIntegration:
         # Should not exceed max grid levels
         assert pm.get_position_count('Buy') <= 3
 
-    def test_risk_limit_emergency_close(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_risk_limit_emergency_close(self, make_strategy):
         """Test emergency close when approaching liquidation"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy()
+        pm = strategy.pm
 
         # Open LONG position
         pm.add_position('Buy', 100.0, 1.0, 0)
@@ -157,16 +162,10 @@ class TestGridStrategyIntegration:
         # Note: In current implementation, it clears positions
         # In real scenario, it would place close order
 
-    def test_pnl_calculation_consistency(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_pnl_calculation_consistency(self, make_strategy):
         """Test PnL calculations remain consistent through operations"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy()
+        pm = strategy.pm
 
         # Open LONG position
         pm.add_position('Buy', 100.0, 0.1, 0)
@@ -187,22 +186,16 @@ class TestGridStrategyIntegration:
 
         # PnL at average entry should be ~0
         pnl_at_avg = pm.calculate_pnl(avg_entry, 'Buy')
-        assert pnl_at_avg == pytest.approx(0.0, abs=0.01)
+        assert abs(pnl_at_avg) < 0.01
 
 
 class TestStrategyWithMetricsIntegration:
     """Integration tests for strategy with metrics tracking"""
 
-    def test_metrics_logging_on_trades(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_metrics_logging_on_trades(self, make_strategy, mock_metrics_tracker):
         """Test that metrics are logged correctly during trades"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy()
+        pm = strategy.pm
 
         # Add initial position
         pm.add_position('Buy', 100.0, 0.1, 0)
@@ -216,16 +209,10 @@ class TestStrategyWithMetricsIntegration:
 class TestSyncWithExchangeIntegration:
     """Integration tests for exchange sync functionality"""
 
-    def test_sync_restores_state_from_exchange(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_sync_restores_state_from_exchange(self, make_strategy, mock_bybit_client):
         """Test syncing state from exchange on startup"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy()
+        pm = strategy.pm
 
         # Mock exchange having positions
         def get_position_side_effect(symbol, side, category):
@@ -257,16 +244,10 @@ class TestSyncWithExchangeIntegration:
         # Should open new SHORT position (none on exchange)
         assert pm.get_total_quantity('Sell') > 0
 
-    def test_sync_opens_initial_when_no_positions(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_sync_opens_initial_when_no_positions(self, make_strategy, mock_bybit_client):
         """Test sync opens initial positions when none exist"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy()
+        pm = strategy.pm
 
         # Mock no positions on exchange
         mock_bybit_client.get_active_position.return_value = None
@@ -282,47 +263,37 @@ class TestSyncWithExchangeIntegration:
 class TestMultiLevelAveraging:
     """Integration tests for multi-level position averaging"""
 
-    def test_progressive_averaging_long(self, mock_bybit_client, sample_config, mock_metrics_tracker):
-        """Test progressive averaging with multiplier for LONG"""
-        pm = PositionManager(leverage=100)
-        config = sample_config.copy()
-        config['initial_position_size'] = 10.0  # 10 USD
-        config['averaging_multiplier'] = 2.0
-
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
+    @pytest.mark.parametrize("side,level_prices", [
+        ('Buy', (99.0, 98.0)),
+        ('Sell', (101.0, 102.0)),
+    ], ids=["long", "short"])
+    def test_progressive_averaging(self, make_strategy, side, level_prices):
+        """Test progressive averaging with multiplier"""
+        strategy = make_strategy(
+            initial_position_size=10.0,  # 10 USD
+            averaging_multiplier=2.0
         )
+        pm = strategy.pm
 
         # Level 0: 10 USD
-        pm.add_position('Buy', 100.0, 0.1, 0)
+        pm.add_position(side, 100.0, 0.1, 0)
 
         # Level 1: Should be ~10 USD (current 10 * (2-1))
-        strategy._execute_grid_order('Buy', 99.0)
-
         # Level 2: Should be ~20 USD (current 20 * (2-1))
-        strategy._execute_grid_order('Buy', 98.0)
+        for price in level_prices:
+            strategy._execute_grid_order(side, price)
 
         # Check positions were added
-        assert pm.get_position_count('Buy') == 3
+        assert pm.get_position_count(side) == 3
 
         # Total exposure increases progressively
-        total_qty = pm.get_total_quantity('Buy')
+        total_qty = pm.get_total_quantity(side)
         assert total_qty > 0.1
 
-    def test_average_entry_price_calculation(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_average_entry_price_calculation(self, make_strategy):
         """Test average entry price after multiple averaging"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_strategy()
+        pm = strategy.pm
 
         # Add positions at different prices
         pm.add_position('Buy', 100.0, 0.1, 0)  # 10 USD
@@ -337,16 +308,10 @@ class TestMultiLevelAveraging:
 class TestEdgeCases:
     """Integration tests for edge cases"""
 
-    def test_rapid_price_fluctuations(self, mock_bybit_client, sample_config, mock_metrics_tracker):
+    def test_rapid_price_fluctuations(self, make_stub_strategy):
         """Test handling of rapid price changes"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+        strategy = make_stub_strategy()
+        pm = strategy.pm
 
         pm.add_position('Buy', 100.0, 0.1, 0)
 
@@ -358,39 +323,18 @@ class TestEdgeCases:
         # Bot should handle without errors
         assert pm.get_position_count('Buy') >= 0
 
-    def test_zero_positions_handling(self, mock_bybit_client, sample_config, mock_metrics_tracker):
-        """Test handling when no positions exist"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
-
-        # No positions, should not crash
-        strategy.on_price_update(100.0)
-
-        assert pm.get_position_count('Buy') == 0
-        assert pm.get_position_count('Sell') == 0
-
-    def test_extreme_price_movements(self, mock_bybit_client, sample_config, mock_metrics_tracker):
-        """Test handling of extreme price movements"""
-        pm = PositionManager(leverage=100)
-        strategy = GridStrategy(
-            client=mock_bybit_client,
-            position_manager=pm,
-            config=sample_config,
-            dry_run=True,
-            metrics_tracker=mock_metrics_tracker
-        )
+    @pytest.mark.parametrize("seed_long,price,expected_counts", [
+        (False, 100.0, (0, 0)),  # No positions: nothing to average or close
+        (True, 90.0, (2, 0)),    # Extreme 10% drop: averages one level (dry run, no risk close)
+    ], ids=["zero_positions", "extreme_drop"])
+    def test_price_update_edge_cases(self, make_stub_strategy, seed_long, price, expected_counts):
+        """Test price updates with no positions or after an extreme move"""
+        strategy = make_stub_strategy()
+        pm = strategy.pm
 
-        pm.add_position('Buy', 100.0, 0.1, 0)
+        if seed_long:
+            pm.add_position('Buy', 100.0, 0.1, 0)
 
-        # Extreme price drop (10%)
-        strategy.on_price_update(90.0)
+        strategy.on_price_update(price)
 
-        # Should handle without crashing
-        # Risk limits should trigger emergency close
-        assert True  # Test passes if no exception
+        assert (pm.get_position_count('Buy'), pm.get_position_count('Sell')) == expected_counts
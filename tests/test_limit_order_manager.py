@@ -1,280 +1,269 @@
 """Tests for Limit Order Manager"""
 
-import unittest
-import time
-from unittest.mock import Mock, MagicMock, patch
+import math
+import pytest
+from unittest.mock import Mock
 from src.utils.limit_order_manager import LimitOrderManager
-from config.constants import TradingConstants
 
 
-class TestLimitOrderManager(unittest.TestCase):
-    """Test cases for LimitOrderManager"""
+SYMBOL = "BTCUSDT"
+CATEGORY = "linear"
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.mock_client = Mock()
-        self.symbol = "BTCUSDT"
-        self.category = "linear"
-        
-        self.manager = LimitOrderManager(
-            client=self.mock_client,
-            symbol=self.symbol,
-            category=self.category,
-            dry_run=False
-        )
+# Canned place_order responses (read-only, shared by all tests)
+_ORDER_OK = {'retCode': 0, 'result': {'orderId': 'test_order_123'}}
+_ORDER_REJECTED = {'retCode': 10001, 'retMsg': 'Error message'}
+
+# Three limit attempts (initial + 2 retries) followed by the market fallback
+_RETRY_RESPONSES = [
+    {'retCode': 0, 'result': {'orderId': f'order_{i}'}} for i in range(1, 4)
+] + [{'retCode': 0, 'result': {'orderId': 'order_market'}}]
+
+
+@pytest.fixture(scope="module")
+def _client_template():
+    """Client mock built once per module and reset by mock_client"""
+    return Mock()
+
+
+@pytest.fixture(scope="module")
+def _manager_template(_client_template):
+    """LimitOrderManager built once per module and reset by manager"""
+    return LimitOrderManager(
+        client=_client_template,
+        symbol=SYMBOL,
+        category=CATEGORY,
+        dry_run=False
+    )
 
-    def tearDown(self):
-        """Clean up after tests"""
-        self.manager.cleanup()
 
-    def test_calculate_limit_price_buy(self):
+@pytest.fixture
+def mock_client(_client_template):
+    """Mock Bybit client with no configured responses"""
+    _client_template.reset_mock(return_value=True, side_effect=True)
+    return _client_template
+
+
+@pytest.fixture
+def manager(_manager_template, mock_client):
+    """LimitOrderManager without callbacks; timers and tracked orders cleared afterwards"""
+    _manager_template.set_callbacks()
+    yield _manager_template
+    _manager_template.cleanup()
+
+
+class TestLimitOrderManager:
+    """Test cases for LimitOrderManager"""
+
+    def test_calculate_limit_price_buy(self, manager):
         """Test limit price calculation for Buy orders"""
         current_price = 100.0
         offset_percent = 0.03  # 0.03%
-        
-        limit_price = self.manager.calculate_limit_price(
+
+        limit_price = manager.calculate_limit_price(
             side='Buy',
             current_price=current_price,
             offset_percent=offset_percent
         )
-        
+
         # Buy orders should be slightly above market
         expected_price = current_price * (1 + offset_percent / 100)
-        self.assertAlmostEqual(limit_price, expected_price, places=4)
-        self.assertGreater(limit_price, current_price)
+        assert math.isclose(limit_price, expected_price, rel_tol=0, abs_tol=1e-4)
+        assert limit_price > current_price
 
-    def test_calculate_limit_price_sell(self):
+    def test_calculate_limit_price_sell(self, manager):
         """Test limit price calculation for Sell orders"""
         current_price = 100.0
         offset_percent = 0.03  # 0.03%
-        
-        limit_price = self.manager.calculate_limit_price(
+
+        limit_price = manager.calculate_limit_price(
             side='Sell',
             current_price=current_price,
             offset_percent=offset_percent
         )
-        
+
         # Sell orders should be slightly below market
         expected_price = current_price * (1 - offset_percent / 100)
-        self.assertAlmostEqual(limit_price, expected_price, places=4)
-        self.assertLess(limit_price, current_price)
+        assert math.isclose(limit_price, expected_price, rel_tol=0, abs_tol=1e-4)
+        assert limit_price < current_price
 
-    def test_place_limit_order_success(self):
+    def test_place_limit_order_success(self, manager, mock_client):
         """Test successful limit order placement"""
         # Mock successful API response
-        self.mock_client.place_order.return_value = {
-            'retCode': 0,
-            'result': {
-                'orderId': 'test_order_123'
-            }
-        }
-        
-        order_id = self.manager.place_limit_order(
+        mock_client.place_order.return_value = _ORDER_OK
+
+        order_id = manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test order'
         )
-        
-        self.assertEqual(order_id, 'test_order_123')
-        self.assertIn('test_order_123', self.manager._tracked_orders)
-        
+
+        assert order_id == 'test_order_123'
+        assert 'test_order_123' in manager._tracked_orders
+
         # Verify order was placed with correct parameters
-        self.mock_client.place_order.assert_called_once()
-        call_args = self.mock_client.place_order.call_args
-        self.assertEqual(call_args[1]['symbol'], self.symbol)
-        self.assertEqual(call_args[1]['side'], 'Buy')
-        self.assertEqual(call_args[1]['qty'], 1.0)
-        self.assertEqual(call_args[1]['order_type'], 'Limit')
-        self.assertIsNotNone(call_args[1]['price'])
-
-    def test_place_limit_order_failure(self):
+        mock_client.place_order.assert_called_once()
+        call_args = mock_client.place_order.call_args
+        assert call_args[1]['symbol'] == SYMBOL
+        assert call_args[1]['side'] == 'Buy'
+        assert call_args[1]['qty'] == 1.0
+        assert call_args[1]['order_type'] == 'Limit'
+        assert call_args[1]['price'] is not None
+
+    def test_place_limit_order_failure(self, manager, mock_client):
         """Test limit order placement failure"""
         # Mock failed API response
-        self.mock_client.place_order.return_value = {
-            'retCode': 10001,
-            'retMsg': 'Error message'
-        }
-        
-        order_id = self.manager.place_limit_order(
+        mock_client.place_order.return_value = _ORDER_REJECTED
+
+        order_id = manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test order'
         )
-        
-        self.assertIsNone(order_id)
 
-    def test_on_order_filled(self):
+        assert order_id is None
+
+    def test_on_order_filled(self, manager, mock_client):
         """Test handling of filled order"""
         # Place an order first
-        self.mock_client.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': 'test_order_123'}
-        }
-        
-        order_id = self.manager.place_limit_order(
+        mock_client.place_order.return_value = _ORDER_OK
+
+        order_id = manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test'
         )
-        
-        # Set up callback
-        callback_called = []
+
+        # Set up callback (records call count and the last filled order id/info)
+        filled = [0, None, None]
         def on_filled(oid, info):
-            callback_called.append((oid, info))
-        
-        self.manager.set_callbacks(on_filled=on_filled)
-        
+            filled[0] += 1
+            filled[1] = oid
+            filled[2] = info
+
+        manager.set_callbacks(on_filled=on_filled)
+
         # Simulate filled order
         order_data = {
             'orderId': order_id,
             'orderStatus': 'Filled'
         }
-        
-        self.manager.on_order_update(order_data)
-        
-        # Verify callback was called
-        self.assertEqual(len(callback_called), 1)
-        self.assertEqual(callback_called[0][0], order_id)
-        
+
+        manager.on_order_update(order_data)
+
+        # Verify callback was called with the filled order
+        assert filled[0] == 1
+        assert filled[1] == order_id
+        assert filled[2]['status'] == 'Filled'
+
         # Verify order removed from tracking
-        self.assertNotIn(order_id, self.manager._tracked_orders)
+        assert order_id not in manager._tracked_orders
 
-    def test_dry_run_mode(self):
+    def test_dry_run_mode(self, mock_client):
         """Test dry run mode doesn't place real orders"""
         dry_run_manager = LimitOrderManager(
-            client=self.mock_client,
-            symbol=self.symbol,
-            category=self.category,
+            client=mock_client,
+            symbol=SYMBOL,
+            category=CATEGORY,
             dry_run=True
         )
-        
+
         order_id = dry_run_manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test'
         )
-        
+
         # Should return dry run ID
-        self.assertIsNotNone(order_id)
-        self.assertTrue(order_id.startswith('DRY_RUN_'))
-        
+        assert order_id is not None
+        assert order_id.startswith('DRY_RUN_')
+
         # Should not call actual API
-        self.mock_client.place_order.assert_not_called()
-        
+        mock_client.place_order.assert_not_called()
+
         dry_run_manager.cleanup()
 
-    def test_update_current_price(self):
+    def test_update_current_price(self, manager, mock_client):
         """Test updating current price for tracked order"""
         # Place an order
-        self.mock_client.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': 'test_order_123'}
-        }
-        
-        order_id = self.manager.place_limit_order(
+        mock_client.place_order.return_value = _ORDER_OK
+
+        order_id = manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test'
         )
-        
+
         # Update price
         new_price = 105.0
-        self.manager.update_current_price(order_id, new_price)
-        
+        manager.update_current_price(order_id, new_price)
+
         # Verify price was updated
-        order_info = self.manager.get_tracked_order(order_id)
-        self.assertEqual(order_info['current_price'], new_price)
-
-
-class TestLimitOrderTimeout(unittest.TestCase):
-    """Test cases for limit order timeout and retry logic"""
-
-    def setUp(self):
-        """Set up test fixtures"""
-        self.mock_client = Mock()
-        self.symbol = "BTCUSDT"
-        
-        # Use shorter timeout for testing
-        self.original_timeout = TradingConstants.LIMIT_ORDER_TIMEOUT_SEC
-        TradingConstants.LIMIT_ORDER_TIMEOUT_SEC = 0.5  # 500ms for testing
-        
-        self.manager = LimitOrderManager(
-            client=self.mock_client,
-            symbol=self.symbol,
-            category="linear",
-            dry_run=False
-        )
+        order_info = manager.get_tracked_order(order_id)
+        assert order_info['current_price'] == new_price
 
-    def tearDown(self):
-        """Clean up after tests"""
-        TradingConstants.LIMIT_ORDER_TIMEOUT_SEC = self.original_timeout
-        self.manager.cleanup()
 
-    def test_timeout_triggers_retry(self):
+def _expire(manager, order_id):
+    """Fire the order's timeout now (its real timer is cancelled first)"""
+    manager._timers[order_id].cancel()
+    manager._handle_timeout(order_id)
+
+
+class TestLimitOrderTimeout:
+    """Test cases for limit order timeout and retry logic
+
+    Timeouts are driven synchronously through _expire() instead of waiting
+    for the real timer threads to fire.
+    """
+
+    def test_timeout_triggers_retry(self, manager, mock_client):
         """Test that timeout triggers order retry"""
-        # Mock successful order placement
-        self.mock_client.place_order.return_value = {
-            'retCode': 0,
-            'result': {'orderId': 'test_order_123'}
-        }
-        
+        # Mock successful order placement (initial limit, then retry limit)
+        mock_client.place_order.side_effect = _RETRY_RESPONSES
+
         # Place initial order
-        order_id = self.manager.place_limit_order(
+        order_id = manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test',
             retry_count=0
         )
-        
-        self.assertIsNotNone(order_id)
-        
-        # Wait for timeout
-        time.sleep(0.6)
-        
+
+        assert order_id is not None
+
+        _expire(manager, order_id)
+
         # Should have cancelled old order and placed new one
-        self.mock_client.cancel_order.assert_called()
-        
+        mock_client.cancel_order.assert_called_once_with(SYMBOL, order_id, CATEGORY)
+
         # Should have called place_order twice (initial + retry)
-        self.assertEqual(self.mock_client.place_order.call_count, 2)
+        assert mock_client.place_order.call_count == 2
+        assert manager.get_tracked_order('order_2')['retry_count'] == 1
 
-    def test_max_retries_fallback_to_market(self):
+    def test_max_retries_fallback_to_market(self, manager, mock_client):
         """Test that max retries leads to market order fallback"""
-        # Mock successful order placement for limit orders
-        self.mock_client.place_order.side_effect = [
-            {'retCode': 0, 'result': {'orderId': 'order_1'}},  # Initial limit
-            {'retCode': 0, 'result': {'orderId': 'order_2'}},  # Retry 1 limit
-            {'retCode': 0, 'result': {'orderId': 'order_3'}},  # Retry 2 limit
-            {'retCode': 0, 'result': {'orderId': 'order_market'}}  # Market fallback
-        ]
-        
+        # Mock successful order placement for limit orders and the market fallback
+        mock_client.place_order.side_effect = _RETRY_RESPONSES
+
         # Place initial order (retry_count = 0)
-        order_id = self.manager.place_limit_order(
+        manager.place_limit_order(
             side='Buy',
             qty=1.0,
             current_price=100.0,
             reason='Test',
             retry_count=0
         )
-        
-        # Wait for timeout and first retry
-        time.sleep(0.6)
-        
-        # Wait for second retry
-        time.sleep(0.6)
-        
-        # Wait for third timeout (should trigger market fallback)
-        time.sleep(0.6)
-        
-        # Should have placed 3 limit orders + 1 market order
-        self.assertGreaterEqual(self.mock_client.place_order.call_count, 3)
-
 
-if __name__ == '__main__':
-    unittest.main()
+        # Two timeouts retry as limit orders, the third falls back to market
+        for order_id in ('order_1', 'order_2', 'order_3'):
+            _expire(manager, order_id)
 
+        # Should have placed 3 limit orders + 1 market order
+        assert mock_client.place_order.call_count == 4
+        assert mock_client.place_order.call_args[1]['order_type'] == 'Market'
+        assert manager._tracked_orders == {}
@@ -3,7 +3,10 @@
 import pytest
 from datetime import datetime
 from src.strategy.position_manager import PositionManager, Position
-from src.utils.timezone import now_helsinki
+
+
+# Fixed position timestamp (now_helsinki() itself is covered in test_timezone.py)
+_T0 = datetime(2025, 1, 15, 10, 30)
 
 
 class TestPosition:
@@ -15,15 +18,12 @@ class TestPosition:
             side='Buy',
             entry_price=100.0,
             quantity=0.5,
-            timestamp=now_helsinki(),
+            timestamp=_T0,
             grid_level=0
         )
 
-        assert pos.side == 'Buy'
-        assert pos.entry_price == 100.0
-        assert pos.quantity == 0.5
-        assert pos.grid_level == 0
-        assert isinstance(pos.timestamp, datetime)
+        assert (pos.side, pos.entry_price, pos.quantity, pos.timestamp, pos.grid_level, pos.order_id) \
+            == ('Buy', 100.0, 0.5, _T0, 0, None)
 
 
 class TestPositionManager:
@@ -88,7 +88,7 @@ class TestPositionManager:
         # Total: 29.8 USD for 0.3 qty = 99.333 avg
 
         avg = position_manager.get_average_entry_price('Buy')
-        assert avg == pytest.approx(99.333, rel=0.01)
+        assert avg == pytest.approx(99.3333, abs=1e-3)
 
     def test_get_average_entry_price_short(self, position_manager):
         """Test calculating average entry price for SHORT"""
@@ -97,60 +97,44 @@ class TestPositionManager:
         # Total: 30.4 USD for 0.3 qty = 101.333 avg
 
         avg = position_manager.get_average_entry_price('Sell')
-        assert avg == pytest.approx(101.333, rel=0.01)
+        assert avg == pytest.approx(101.3333, abs=1e-3)
 
     def test_get_average_entry_price_no_positions(self, position_manager):
         """Test average entry price with no positions"""
         avg = position_manager.get_average_entry_price('Buy')
         assert avg is None
 
-    def test_calculate_pnl_long_profit(self, position_manager):
-        """Test PnL calculation for LONG in profit"""
-        position_manager.add_position('Buy', 100.0, 0.1, 0)
-        current_price = 110.0
-
-        pnl = position_manager.calculate_pnl(current_price, 'Buy')
-        # Entry: 0.1 @ 100
-        # Current: 0.1 @ 110
-        # Price change: +10
-        # PnL: 0.1 * 10 = +1.0 USD (leverage does NOT affect PnL!)
-        assert pnl == pytest.approx(1.0)
-
-    def test_calculate_pnl_long_loss(self, position_manager):
-        """Test PnL calculation for LONG in loss"""
+    def test_totals_track_position_changes(self, position_manager):
+        """Test running quantity/average totals follow add/remove on each side"""
         position_manager.add_position('Buy', 100.0, 0.1, 0)
-        current_price = 90.0
-
-        pnl = position_manager.calculate_pnl(current_price, 'Buy')
-        # Entry: 0.1 @ 100
-        # Current: 0.1 @ 90
-        # Price change: -10
-        # PnL: 0.1 * (-10) = -1.0 USD (leverage does NOT affect PnL!)
-        assert pnl == pytest.approx(-1.0)
-
-    def test_calculate_pnl_short_profit(self, position_manager):
-        """Test PnL calculation for SHORT in profit"""
         position_manager.add_position('Sell', 100.0, 0.1, 0)
-        current_price = 90.0
+        assert position_manager.get_average_entry_price('Buy') == pytest.approx(100.0)
+        assert position_manager.get_average_entry_price('Sell') == pytest.approx(100.0)
 
-        pnl = position_manager.calculate_pnl(current_price, 'Sell')
-        # Entry: 0.1 @ 100
-        # Current: 0.1 @ 90
-        # Price change: +10 (for short)
-        # PnL: 0.1 * 10 = +1.0 USD (leverage does NOT affect PnL!)
-        assert pnl == pytest.approx(1.0)
+        position_manager.add_position('Buy', 97.0, 0.2, 1)
+        assert position_manager.get_average_entry_price('Buy') == pytest.approx(98.0)
+        assert position_manager.get_total_quantity('Buy') == pytest.approx(0.3)
+        assert position_manager.get_average_entry_price('Sell') == pytest.approx(100.0)
 
-    def test_calculate_pnl_short_loss(self, position_manager):
-        """Test PnL calculation for SHORT in loss"""
-        position_manager.add_position('Sell', 100.0, 0.1, 0)
-        current_price = 110.0
-
-        pnl = position_manager.calculate_pnl(current_price, 'Sell')
-        # Entry: 0.1 @ 100
-        # Current: 0.1 @ 110
-        # Price change: -10 (for short)
-        # PnL: 0.1 * (-10) = -1.0 USD (leverage does NOT affect PnL!)
-        assert pnl == pytest.approx(-1.0)
+        position_manager.remove_all_positions('Buy')
+        assert position_manager.get_average_entry_price('Buy') is None
+        assert position_manager.get_total_quantity('Buy') == 0
+        assert position_manager.get_average_entry_price('Sell') == pytest.approx(100.0)
+
+    @pytest.mark.parametrize("side,current_price,expected", [
+        ('Buy', 110.0, 1.0),    # 0.1 * (+10)
+        ('Buy', 90.0, -1.0),    # 0.1 * (-10)
+        ('Sell', 90.0, 1.0),    # 0.1 * (+10 for short)
+        ('Sell', 110.0, -1.0),  # 0.1 * (-10 for short)
+    ], ids=["long_profit", "long_loss", "short_profit", "short_loss"])
+    def test_calculate_pnl(self, position_manager, side, current_price, expected):
+        """Test PnL calculation for a single 0.1 @ 100 position"""
+        position_manager.add_position(side, 100.0, 0.1, 0)
+
+        pnl = position_manager.calculate_pnl(current_price, side)
+        # PnL = quantity * price change in the position's favour
+        # (leverage does NOT affect PnL!)
+        assert pnl == pytest.approx(expected)
 
     def test_calculate_pnl_multiple_positions(self, position_manager):
         """Test PnL with multiple positions"""
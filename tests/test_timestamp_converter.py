@@ -1,18 +1,43 @@
 """Tests for TimestampConverter utility"""
 
 import pytest
-from datetime import datetime
-import pytz
+from datetime import datetime, timezone
 from src.utils.timestamp_converter import TimestampConverter
 
 
+def _utc_ms(*fields):
+    """Millisecond epoch timestamp of a UTC wall-clock time"""
+    return int(datetime(*fields, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+# Fixed UTC instants used across tests (built once at import)
+_TS_2025_01_15_1030 = 1736939400000  # 2025-01-15 10:30:00 UTC
+_TS_2025_03_15_102537 = _utc_ms(2025, 3, 15, 10, 25, 37)
+_TS_2025_05_20_1430 = _utc_ms(2025, 5, 20, 14, 30, 0)
+_TS_2025_06_15_0000 = _utc_ms(2025, 6, 15, 0, 0, 0)
+_TS_2025_10_12_143045 = _utc_ms(2025, 10, 12, 14, 30, 45)
+_TS_2025_12_31_235959 = _utc_ms(2025, 12, 31, 23, 59, 59)
+
+# (timestamp_ms, is_valid_timestamp_ms result) around the 2020-2050 range
+_VALIDITY_CASES = [
+    (1736899200000, True),   # 2025-01-15
+    (1577836800000, True),   # Minimum boundary: 2020-01-01 00:00:00 UTC
+    (1577836799999, False),
+    (2524608000000, True),   # Maximum boundary: 2050-01-01 00:00:00 UTC
+    (2524608000001, False),
+    (1577750400000, False),  # 2019-12-31 (too old)
+    (2556144000000, False),  # 2051-01-01 (too far in future)
+    (0, False),
+    (-1000, False),
+]
+
+
 class TestTimestampConverter:
     """Test TimestampConverter utility class"""
 
     def test_exchange_ms_to_helsinki_valid_timestamp(self):
         """Test converting valid millisecond timestamp to Helsinki time"""
-        # 2025-01-15 10:30:00 UTC = 1736939400000 ms
-        timestamp_ms = 1736939400000
+        timestamp_ms = _TS_2025_01_15_1030
 
         result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
 
@@ -22,7 +47,7 @@ class TestTimestampConverter:
         assert len(result) == 19  # Format: "2025-01-15 12:30:00"
 
         # Parse back to check correctness
-        dt = datetime.strptime(result, "%Y-%m-%d %H:%M:%S")
+        dt = datetime.fromisoformat(result)
         assert dt.year == 2025
         assert dt.month == 1
         assert dt.day == 15
@@ -39,84 +64,27 @@ class TestTimestampConverter:
 
         assert result is None
 
-    def test_exchange_ms_to_helsinki_known_date(self):
-        """Test conversion with a known date/time"""
-        # 2024-01-01 00:00:00 UTC = 1704067200000 ms
-        # Helsinki is UTC+2 in winter, so should be 02:00:00
-        timestamp_ms = 1704067200000
-
+    @pytest.mark.parametrize("timestamp_ms,expected", [
+        # 2024-01-01 00:00:00 UTC - Helsinki is UTC+2 in winter
+        (1704067200000, "2024-01-01 02:00:00"),
+        # 2024-07-01 12:00:00 UTC - Helsinki is UTC+3 in summer
+        (1719835200000, "2024-07-01 15:00:00"),
+        # In October, Helsinki is still UTC+3 (summer time), so 14:30 UTC = 17:30 Helsinki
+        (_TS_2025_10_12_143045, "2025-10-12 17:30:45"),
+        # In June, Helsinki is UTC+3, so 00:00 UTC = 03:00 Helsinki on the same date
+        (_TS_2025_06_15_0000, "2025-06-15 03:00:00"),
+    ], ids=["known_date", "summer_time", "recent_timestamp", "midnight_utc"])
+    def test_exchange_ms_to_helsinki_known_dates(self, timestamp_ms, expected):
+        """Test conversion of known UTC instants to Helsinki date and time"""
         result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
 
-        # Should contain "2024-01-01" and "02:00:00" (Helsinki time)
-        assert "2024-01-01" in result
-        assert "02:00:00" in result
-
-    def test_exchange_ms_to_helsinki_summer_time(self):
-        """Test conversion during Helsinki summer time (UTC+3)"""
-        # 2024-07-01 12:00:00 UTC = 1719835200000 ms
-        # Helsinki is UTC+3 in summer, so should be 15:00:00
-        timestamp_ms = 1719835200000
-
-        result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
-
-        assert "2024-07-01" in result
-        assert "15:00:00" in result
-
-    def test_exchange_ms_to_helsinki_recent_timestamp(self):
-        """Test with a recent timestamp (2025)"""
-        # 2025-10-12 14:30:45 UTC
-        utc_dt = datetime(2025, 10, 12, 14, 30, 45, tzinfo=pytz.UTC)
-        timestamp_ms = int(utc_dt.timestamp() * 1000)
-
-        result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
-
-        assert result is not None
-        assert "2025-10-12" in result
-        # In October, Helsinki is UTC+3 (summer time), so 14:30 UTC = 17:30 Helsinki
-        assert "17:30:45" in result
-
-    def test_is_valid_timestamp_ms_valid_range(self):
-        """Test validation of timestamps in valid range"""
-        # 2025-01-15
-        timestamp_2025 = 1736899200000
-
-        assert TimestampConverter.is_valid_timestamp_ms(timestamp_2025) is True
-
-    def test_is_valid_timestamp_ms_min_boundary(self):
-        """Test validation at minimum boundary (2020-01-01)"""
-        min_timestamp = 1577836800000  # 2020-01-01 00:00:00 UTC
-
-        assert TimestampConverter.is_valid_timestamp_ms(min_timestamp) is True
-        assert TimestampConverter.is_valid_timestamp_ms(min_timestamp - 1) is False
-
-    def test_is_valid_timestamp_ms_max_boundary(self):
-        """Test validation at maximum boundary (2050-01-01)"""
-        max_timestamp = 2524608000000  # 2050-01-01 00:00:00 UTC
-
-        assert TimestampConverter.is_valid_timestamp_ms(max_timestamp) is True
-        assert TimestampConverter.is_valid_timestamp_ms(max_timestamp + 1) is False
-
-    def test_is_valid_timestamp_ms_too_old(self):
-        """Test validation of timestamp before 2020"""
-        # 2019-12-31
-        old_timestamp = 1577750400000
-
-        assert TimestampConverter.is_valid_timestamp_ms(old_timestamp) is False
+        assert result == expected
 
-    def test_is_valid_timestamp_ms_too_future(self):
-        """Test validation of timestamp after 2050"""
-        # 2051-01-01
-        future_timestamp = 2556144000000
-
-        assert TimestampConverter.is_valid_timestamp_ms(future_timestamp) is False
-
-    def test_is_valid_timestamp_ms_zero(self):
-        """Test validation of zero timestamp"""
-        assert TimestampConverter.is_valid_timestamp_ms(0) is False
-
-    def test_is_valid_timestamp_ms_negative(self):
-        """Test validation of negative timestamp"""
-        assert TimestampConverter.is_valid_timestamp_ms(-1000) is False
+    def test_is_valid_timestamp_ms(self):
+        """Test validation of timestamps against the 2020-2050 range"""
+        # Compared as one list so a failure shows every mismatching case at once
+        results = [TimestampConverter.is_valid_timestamp_ms(ts) for ts, _ in _VALIDITY_CASES]
+        assert results == [expected for _, expected in _VALIDITY_CASES]
 
     def test_convert_actual_bybit_timestamp(self):
         """Test with actual Bybit-style timestamp format"""
@@ -128,13 +96,12 @@ class TestTimestampConverter:
         assert result is not None
         assert len(result) == 19
         # Should be valid timestamp format
-        datetime.strptime(result, "%Y-%m-%d %H:%M:%S")
+        datetime.fromisoformat(result)
 
     def test_conversion_preserves_seconds(self):
         """Test that seconds are correctly preserved in conversion"""
         # Create timestamp with specific seconds value
-        utc_dt = datetime(2025, 3, 15, 10, 25, 37, tzinfo=pytz.UTC)
-        timestamp_ms = int(utc_dt.timestamp() * 1000)
+        timestamp_ms = _TS_2025_03_15_102537
 
         result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
 
@@ -143,40 +110,25 @@ class TestTimestampConverter:
 
     def test_multiple_conversions_consistency(self):
         """Test that multiple conversions of same timestamp are consistent"""
-        timestamp_ms = 1736939400000
+        timestamp_ms = _TS_2025_01_15_1030
 
         result1 = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
         result2 = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
-        result3 = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
 
-        assert result1 == result2 == result3
+        assert result1 == result2
 
     def test_static_method_no_instance_needed(self):
         """Test that methods are static and work without instance"""
         # Should work without creating instance
-        timestamp_ms = 1736939400000
+        timestamp_ms = _TS_2025_01_15_1030
         result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
 
         assert result is not None
 
-    def test_edge_case_midnight(self):
-        """Test conversion at midnight UTC"""
-        # 2025-06-15 00:00:00 UTC
-        utc_dt = datetime(2025, 6, 15, 0, 0, 0, tzinfo=pytz.UTC)
-        timestamp_ms = int(utc_dt.timestamp() * 1000)
-
-        result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
-
-        # In June, Helsinki is UTC+3, so 00:00 UTC = 03:00 Helsinki
-        assert "03:00:00" in result
-        # But date should still be June 15
-        assert "2025-06-15" in result
-
     def test_edge_case_end_of_day(self):
         """Test conversion near end of day"""
         # 2025-12-31 23:59:59 UTC
-        utc_dt = datetime(2025, 12, 31, 23, 59, 59, tzinfo=pytz.UTC)
-        timestamp_ms = int(utc_dt.timestamp() * 1000)
+        timestamp_ms = _TS_2025_12_31_235959
 
         result = TimestampConverter.exchange_ms_to_helsinki(timestamp_ms)
 
@@ -184,7 +136,7 @@ class TestTimestampConverter:
         # In December, Helsinki is UTC+2 (winter time)
         # 23:59:59 UTC = 01:59:59 next day Helsinki
         # But this would be Jan 1, 2026
-        parsed_dt = datetime.strptime(result, "%Y-%m-%d %H:%M:%S")
+        parsed_dt = datetime.fromisoformat(result)
         assert parsed_dt.year == 2026
         assert parsed_dt.month == 1
         assert parsed_dt.day == 1
@@ -192,8 +144,7 @@ class TestTimestampConverter:
     def test_round_trip_validation(self):
         """Test that we can validate timestamps we create"""
         # Create a timestamp
-        utc_dt = datetime(2025, 5, 20, 14, 30, 0, tzinfo=pytz.UTC)
-        timestamp_ms = int(utc_dt.timestamp() * 1000)
+        timestamp_ms = _TS_2025_05_20_1430
 
         # Should be valid
         assert TimestampConverter.is_valid_timestamp_ms(timestamp_ms) is True